@@ -0,0 +1,55 @@
+import importlib
+
+# Public names resolve to their submodule on first access, so `import binomial_lattice`
+# stays cheap and pandas/pyarrow are only loaded by the code paths that write or read files.
+_EXPORTS = {
+    "UpDownSpecification": "lattice_engine",
+    "OptionType": "lattice_engine",
+    "Lattice_Backend": "lattice_engine",
+    "Lattice_Result": "lattice_engine",
+    "Lattice_Cache": "lattice_engine",
+    "Recombining_Lattice": "lattice_engine",
+    "Spot_Shift_Lattice": "lattice_engine",
+    "payment_present_values": "lattice_engine",
+    "write_nodes": "lattice_engine",
+    "price_contracts": "lattice_batch",
+    "price_frame": "lattice_batch",
+    "value_portfolio": "lattice_portfolio",
+    "lattice_greeks": "greeks_engine",
+    "richardson_price": "lattice_convergence",
+    "price_to_tolerance": "lattice_convergence",
+    "implied_volatility": "lattice_implied_volatility",
+    "Implied_Volatility_Status": "lattice_implied_volatility",
+    "Term_Structure_Curve": "lattice_term_structure",
+    "Term_Structure_Lattice": "lattice_term_structure",
+    "Pricing_Instrumentation": "lattice_instrumentation",
+    "Prometheus_Sink": "lattice_instrumentation",
+    "logging_sink": "lattice_instrumentation",
+    "bsm_price": "black_scholes_engine",
+    "bsm_greeks": "black_scholes_engine",
+    "bsm_implied_volatility": "black_scholes_engine",
+    "control_variate_price": "black_scholes_engine",
+    "Lattice_Node": "lattice_tree",
+    "Binomial_Lattice_Tree": "lattice_tree",
+    "Payment": "lattice_interval",
+    "Discrete_Payment_Node": "lattice_interval",
+    "Lattice_Node_Interval": "lattice_interval",
+    "Binomial_Lattice_Tree_Interval": "lattice_interval",
+    "Black_Scholes_Merton_Equation": "black_scholes_merton",
+    "value_file": "lattice_cli",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if (module_name == None):
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
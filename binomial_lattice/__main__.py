@@ -0,0 +1,3 @@
+from .lattice_cli import main
+
+main()
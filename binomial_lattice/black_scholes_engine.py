@@ -0,0 +1,113 @@
+import numpy as np
+import math
+from .lattice_engine import OptionType
+from .lattice_batch import DEFAULT_CHUNK_SIZE, contract_arrays, option_flags, price_contracts
+
+# Coefficients of Hart's double-precision rational approximation of the normal tail
+# (algorithm 5666, in the form given by West, 2005), accurate to about 1e-15.
+_TAIL_NUMERATOR = (0.0352624965998911, 0.700383064443688, 6.37396220353165, 33.912866078383, 112.079291497871, 221.213596169931, 220.206867912376)
+_TAIL_DENOMINATOR = (0.0883883476483184, 1.75566716318264, 16.064177579207, 86.7807322029461, 296.564248779674, 637.333633378831, 793.826512519948, 440.413735824752)
+_RATIONAL_LIMIT = 7.07106781186547
+
+EUROPEAN_COUNTERPART = {
+    OptionType.EUROPEAN_CALL: OptionType.EUROPEAN_CALL,
+    OptionType.AMERICAN_CALL: OptionType.EUROPEAN_CALL,
+    OptionType.EUROPEAN_PUT: OptionType.EUROPEAN_PUT,
+    OptionType.AMERICAN_PUT: OptionType.EUROPEAN_PUT,
+}
+
+
+def normal_cdf(x):
+    x = np.asarray(x, dtype=float)
+    distance = np.abs(x)
+    density = np.exp(-0.5*distance**2)
+    # Rational approximation near the centre, continued fraction in the far tail.
+    near = np.minimum(distance, _RATIONAL_LIMIT)
+    tail = density*np.polyval(_TAIL_NUMERATOR, near)/np.polyval(_TAIL_DENOMINATOR, near)
+    far = np.maximum(distance, _RATIONAL_LIMIT)
+    fraction = far + 1/(far + 2/(far + 3/(far + 4/(far + 0.65))))
+    tail = np.where(distance < _RATIONAL_LIMIT, tail, density/(fraction*math.sqrt(2*math.pi)))
+    return np.where(x > 0, 1 - tail, tail)
+
+
+def normal_pdf(x):
+    return np.exp(-0.5*np.asarray(x, dtype=float)**2)/math.sqrt(2*math.pi)
+
+
+def _contract_arrays(option, *values):
+    _, options, arrays = contract_arrays(None, option, *values)
+    is_call, _ = option_flags(options)
+    return is_call, arrays
+
+
+def _d1_d2(present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure):
+    # A contract with no remaining variance is priced off its forward intrinsic value,
+    # which the +/-inf d1 reproduces through the same formulas.
+    sigma_sqrt_t = volatility*np.sqrt(tenure)
+    degenerate = sigma_sqrt_t <= 0
+    safe_sigma_sqrt_t = np.where(degenerate, 1.0, sigma_sqrt_t)
+    d1 = (np.log(present_spot/strike_price) + (risk_free_rate - continuous_income_rate + (volatility**2)/2)*tenure)/safe_sigma_sqrt_t
+    forward_moneyness = present_spot*np.exp(-1*continuous_income_rate*tenure) - strike_price*np.exp(-1*risk_free_rate*tenure)
+    d1 = np.where(degenerate, np.where(forward_moneyness > 0, np.inf, -np.inf), d1)
+    d2 = np.where(degenerate, d1, d1 - sigma_sqrt_t)
+    return d1, d2, safe_sigma_sqrt_t
+
+
+def bsm_value(sign, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure):
+    # Elementwise over broadcastable arrays; sign is +1 for calls and -1 for puts.
+    d1, d2, _ = _d1_d2(present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    return sign*(present_spot*np.exp(-1*continuous_income_rate*tenure)*normal_cdf(sign*d1) - strike_price*np.exp(-1*risk_free_rate*tenure)*normal_cdf(sign*d2))
+
+
+def bsm_price(option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure):
+    # European price for every contract; American option types are priced as their European counterpart.
+    is_call, (spot, strike, rate, income_rate, vol, tenure) = _contract_arrays(option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    return bsm_value(np.where(is_call, 1.0, -1.0), spot, strike, rate, income_rate, vol, tenure)
+
+
+def bsm_greeks(option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure):
+    is_call, (spot, strike, rate, income_rate, vol, tenure) = _contract_arrays(option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    d1, d2, sigma_sqrt_t = _d1_d2(spot, strike, rate, income_rate, vol, tenure)
+    sign = np.where(is_call, 1.0, -1.0)
+    income_discount = np.exp(-1*income_rate*tenure)
+    rate_discount = np.exp(-1*rate*tenure)
+    density = normal_pdf(d1)
+    n_d1 = normal_cdf(sign*d1)
+    n_d2 = normal_cdf(sign*d2)
+    sqrt_t = np.where(tenure > 0, np.sqrt(tenure), 1.0)
+
+    return {
+        "price": sign*(spot*income_discount*n_d1 - strike*rate_discount*n_d2),
+        "delta": sign*income_discount*n_d1,
+        "gamma": income_discount*density/(spot*sigma_sqrt_t),
+        "theta": -1*spot*income_discount*density*vol/(2*sqrt_t) - sign*rate*strike*rate_discount*n_d2 + sign*income_rate*spot*income_discount*n_d1,
+        "vega": spot*income_discount*density*np.sqrt(tenure),
+        "rho": sign*strike*tenure*rate_discount*n_d2,
+    }
+
+
+def control_variate_price(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, chunk_size=DEFAULT_CHUNK_SIZE):
+    # lattice American + (BSM European - lattice European): the lattice discretisation error
+    # measured on the European contract is removed from the American one.
+    specifications, options, contract = contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    european_options = np.array([EUROPEAN_COUNTERPART[option] for option in options], dtype=object)
+
+    lattice_american = price_contracts(specifications, options, *contract, num_period, chunk_size=chunk_size)
+    lattice_european = price_contracts(specifications, european_options, *contract, num_period, chunk_size=chunk_size)
+    return lattice_american + (bsm_price(european_options, *contract) - lattice_european)
+
+
+def bsm_implied_volatility(option, market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure, lower=1e-4, upper=5.0, iterations=20):
+    # Closed-form Newton iteration from the Brenner-Subrahmanyam guess, clipped to
+    # [lower, upper]. Used as a cheap starting point; it does not report failures.
+    is_call, (price, spot, strike, rate, income_rate, tenure) = _contract_arrays(option, market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure)
+    sign = np.where(is_call, 1.0, -1.0)
+    safe_tenure = np.where(tenure > 0, tenure, 1.0)
+    volatility = np.clip(np.sqrt(2*math.pi/safe_tenure)*price/spot, lower, upper)
+    for _ in range(iterations):
+        d1, _, _ = _d1_d2(spot, strike, rate, income_rate, volatility, tenure)
+        vega = spot*np.exp(-1*income_rate*tenure)*normal_pdf(d1)*np.sqrt(tenure)
+        difference = bsm_value(sign, spot, strike, rate, income_rate, volatility, tenure) - price
+        step = np.where(vega > 1e-12, difference/np.where(vega > 1e-12, vega, 1.0), 0.0)
+        volatility = np.clip(volatility - step, lower, upper)
+    return volatility
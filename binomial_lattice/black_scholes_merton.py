@@ -0,0 +1,69 @@
+import numpy as np
+import math
+from datetime import datetime, timedelta
+from enum import Enum
+from .lattice_engine import UpDownSpecification, OptionType, Lattice_Result
+from .black_scholes_engine import bsm_greeks, control_variate_price
+
+class Black_Scholes_Merton_Equation:
+    def __init__(self, specification, option, present_spot, strike_price, risk_free_rate, up, down, start_date, end_date, num_period, continuous_income_rate, volatility):
+        self.specification = specification
+        self.option = option
+        self.present_spot = present_spot
+        self.strike_price = strike_price
+        self.risk_free_rate = risk_free_rate
+        self.up = up
+        self.down = down
+        self.start_date = start_date
+        self.end_date = end_date
+        self.num_period = num_period
+        self.continuous_income_rate = continuous_income_rate if continuous_income_rate else 0
+        self.volatility = volatility
+        self.tenure = (self.end_date - self.start_date).days/365
+
+        contract = (self.present_spot, self.strike_price, self.risk_free_rate, self.continuous_income_rate, self.volatility, self.tenure)
+        greeks = bsm_greeks(self.option, *contract)
+        self.price = float(greeks["price"][0])
+        self.delta = float(greeks["delta"][0])
+        self.gamma = float(greeks["gamma"][0])
+        self.theta = float(greeks["theta"][0])
+        self.vega = float(greeks["vega"][0])
+        self.rho = float(greeks["rho"][0])
+
+        # American contracts have no closed form; the lattice is corrected by its own European
+        # error. The closed-form Greeks above are European ones, so they are not reported.
+        if (option == OptionType.AMERICAN_CALL or option == OptionType.AMERICAN_PUT):
+            self.price = float(control_variate_price(self.specification, self.option, *contract, self.num_period)[0])
+            self.delta = None
+            self.gamma = None
+            self.theta = None
+            self.vega = None
+            self.rho = None
+        self.result = Lattice_Result(self.price, delta=self.delta, gamma=self.gamma, theta=self.theta, vega=self.vega, rho=self.rho)
+
+
+def main():
+
+    # Traditional approach
+    specification = UpDownSpecification.ALTERNATIVE
+    option = OptionType.AMERICAN_CALL
+    enddate = datetime(2020, 10, 1)
+    startdate = datetime(2020, 1, 1)
+    numperiod = 3
+    time_delta = ((enddate - startdate).days/365)/numperiod
+    volatility = 0.05
+    risk_free_rate = 0.05
+    spot_price = 115
+    strike_price = 115
+    continuous_income_rate = 0.06
+    up = math.exp(volatility * math.sqrt(time_delta))
+    down = math.exp(-1*volatility * math.sqrt(time_delta))
+
+
+    equation = Black_Scholes_Merton_Equation(specification, option, spot_price, strike_price, risk_free_rate, up, down, startdate, enddate, numperiod, continuous_income_rate, volatility)
+    print(equation.result)
+
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
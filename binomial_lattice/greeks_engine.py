@@ -0,0 +1,90 @@
+import numpy as np
+from .lattice_batch import DEFAULT_CHUNK_SIZE, contract_arrays, option_flags, lattice_parameters, smoothing_last_step, batch_backward_induction
+
+DEFAULT_VOLATILITY_BUMP = 0.01
+DEFAULT_RATE_BUMP = 0.0001
+
+# Scenario axis of the bumped pass: base, vol up, vol down, rate up, rate down.
+BUMP_SCENARIOS = 5
+
+
+def _head_greeks(price, heads, time_delta):
+    spot_0 = heads[0][0][..., 0]
+    (spot_1, values_1), (spot_2, values_2) = heads[1], heads[2]
+    delta = (values_1[..., 0] - values_1[..., 1])/(spot_1[..., 0] - spot_1[..., 1])
+    upper_delta = (values_2[..., 0] - values_2[..., 1])/(spot_2[..., 0] - spot_2[..., 1])
+    lower_delta = (values_2[..., 1] - values_2[..., 2])/(spot_2[..., 1] - spot_2[..., 2])
+    # The spread is read off the level-2 spots so a dividend-shifted root is handled.
+    gamma = (upper_delta - lower_delta)/(0.5*(spot_2[..., 0] - spot_2[..., 2]))
+    theta = middle_node_theta(price, values_2[..., 1], spot_2[..., 1] - spot_0, delta, gamma, time_delta)
+    return delta, gamma, theta
+
+
+def middle_node_theta(price, middle_value, spot_offset, delta, gamma, time_delta):
+    # The middle level-2 node sits at S*u*d plus the accrued payment PV, which is not the
+    # root spot when u*d != 1 (Leisen-Reimer, ALTERNATIVE) or payments are escrowed; its
+    # value is moved back to the root spot with a second-order expansion in the spot.
+    return (middle_value - price - delta*spot_offset - 0.5*gamma*spot_offset**2)/(2*time_delta)
+
+
+def _greeks_chunk(specifications, is_call, is_american, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, volatility_bump, rate_bump, payment_values, smooth):
+    zero = np.zeros_like(volatility)
+    volatility_shift = np.stack([zero, zero + volatility_bump, zero - volatility_bump, zero, zero])
+    rate_shift = np.stack([zero, zero, zero, zero + rate_bump, zero - rate_bump])
+    bumped_volatility = volatility + volatility_shift
+    bumped_rate = risk_free_rate + rate_shift
+
+    # Spot, strike, payoff sign and exercise flags are shared by every scenario and
+    # broadcast along the leading axis; only up/down/p/discount are rebuilt per bump.
+    # Leisen-Reimer spacing is built from the escrowed spot and strike, as in price_contracts.
+    time_delta = tenure/num_period
+    base_spot = present_spot if payment_values is None else present_spot - payment_values[..., 0]
+    base_strike = strike_price if payment_values is None else strike_price - payment_values[..., -1]
+    up, down, probability = lattice_parameters(specifications, bumped_rate, continuous_income_rate, bumped_volatility, time_delta, base_spot, base_strike, num_period)
+    discount = np.exp(-1*bumped_rate*time_delta)
+    last_step = smoothing_last_step(specifications, is_call, strike_price, bumped_rate, continuous_income_rate, bumped_volatility, time_delta)
+    prices, heads = batch_backward_induction(base_spot[None], strike_price[None], up, down, probability, discount, num_period, is_call[None], is_american[None], None if payment_values is None else payment_values[None], head_levels=3, last_step=last_step)
+
+    price = prices[0]
+    delta, gamma, theta = _head_greeks(price, {level: (spot[0], values[0]) for level, (spot, values) in heads.items()}, time_delta)
+    if (smooth and payment_values is None):
+        # Average with an N+1 step lattice to cancel the odd/even oscillation of the
+        # lattice delta, gamma and theta. Payment vectors are tied to the N step grid,
+        # so dividend-paying contracts keep the unsmoothed values.
+        odd_delta_t = tenure/(num_period + 1)
+        odd_up, odd_down, odd_probability = lattice_parameters(specifications, risk_free_rate, continuous_income_rate, volatility, odd_delta_t, present_spot, strike_price, num_period + 1)
+        odd_last_step = smoothing_last_step(specifications, is_call, strike_price, risk_free_rate, continuous_income_rate, volatility, odd_delta_t)
+        odd_price, odd_heads = batch_backward_induction(present_spot, strike_price, odd_up, odd_down, odd_probability, np.exp(-1*risk_free_rate*odd_delta_t), num_period + 1, is_call, is_american, head_levels=3, last_step=odd_last_step)
+        odd_delta, odd_gamma, odd_theta = _head_greeks(odd_price, odd_heads, odd_delta_t)
+        delta = 0.5*(delta + odd_delta)
+        gamma = 0.5*(gamma + odd_gamma)
+        theta = 0.5*(theta + odd_theta)
+
+    return {
+        "price": price,
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta,
+        "vega": (prices[1] - prices[2])/(2*volatility_bump),
+        "rho": (prices[3] - prices[4])/(2*rate_bump),
+    }
+
+
+def lattice_greeks(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, volatility_bump=DEFAULT_VOLATILITY_BUMP, rate_bump=DEFAULT_RATE_BUMP, payment_values=None, smooth=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    specifications, options, arrays = contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure = arrays
+    size = present_spot.shape[0]
+    if (num_period < 2):
+        raise ValueError("lattice Greeks need at least two periods")
+    if (payment_values is not None):
+        payment_values = np.broadcast_to(np.asarray(payment_values, dtype=float), (size, num_period + 1))
+
+    is_call, is_american = option_flags(options)
+    greeks = {name: np.empty(size) for name in ("price", "delta", "gamma", "theta", "vega", "rho")}
+    chunk_size = max(1, chunk_size//BUMP_SCENARIOS)
+    for start in range(0, size, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        result = _greeks_chunk(specifications[chunk], is_call[chunk], is_american[chunk], present_spot[chunk], strike_price[chunk], risk_free_rate[chunk], continuous_income_rate[chunk], volatility[chunk], tenure[chunk], num_period, volatility_bump, rate_bump, None if payment_values is None else payment_values[chunk], smooth)
+        for name, values in result.items():
+            greeks[name][chunk] = values
+    return greeks
@@ -0,0 +1,204 @@
+import numpy as np
+from .lattice_engine import UpDownSpecification, OptionType, leisen_reimer_parameters
+from .lattice_instrumentation import lattice_node_count
+
+DEFAULT_CHUNK_SIZE = 4096
+
+FRAME_COLUMNS = ("specification", "option", "present_spot", "strike_price", "risk_free_rate", "continuous_income_rate", "volatility", "tenure")
+
+
+def as_enum_array(values, enum_type, size):
+    # Accepts a member, a member name or value, or an array of any of those.
+    if (isinstance(values, enum_type) or np.isscalar(values)):
+        values = [values]*size
+    members = []
+    for value in values:
+        if (isinstance(value, enum_type)):
+            members.append(value)
+        elif (isinstance(value, str)):
+            members.append(enum_type[value])
+        else:
+            members.append(enum_type(int(value)))
+    return np.array(members, dtype=object)
+
+
+def contract_arrays(specification, option, *values):
+    # Shared normalisation of the contract-array entry points: the numeric fields are
+    # broadcast to 1-d float arrays of one common length and specification and option
+    # (skipped when None) are expanded to one enum member per contract.
+    arrays = list(np.broadcast_arrays(*[np.atleast_1d(np.asarray(value, dtype=float)) for value in values]))
+    size = arrays[0].shape[0]
+    specifications = None if specification is None else as_enum_array(specification, UpDownSpecification, size)
+    options = None if option is None else as_enum_array(option, OptionType, size)
+    if ((specifications is not None and len(specifications) != size) or (options is not None and len(options) != size)):
+        raise ValueError("specification and option must be scalars or have one entry per contract")
+    return specifications, options, arrays
+
+
+def option_flags(options):
+    is_call = np.array([option in (OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL) for option in options], dtype=bool)
+    is_american = np.array([option in (OptionType.AMERICAN_CALL, OptionType.AMERICAN_PUT) for option in options], dtype=bool)
+    return is_call, is_american
+
+
+def specification_mask(specifications, *members):
+    return np.array([specification in members for specification in specifications], dtype=bool)
+
+
+def lattice_parameters(specifications, risk_free_rate, continuous_income_rate, volatility, time_delta, present_spot=None, strike_price=None, num_period=None, up=None, down=None):
+    # Vectorized counterpart of the up/down/probability block in Binomial_Lattice_Tree.
+    # Leisen-Reimer contracts also need the spot, strike and step count. TRADITIONAL and
+    # BINOMIAL_BLACK_SCHOLES take the caller's up/down as the tree does; without them the
+    # Cox-Ross-Rubinstein spacing up = exp(volatility*sqrt(dt)), down = 1/up is used.
+    traditional = specification_mask(specifications, UpDownSpecification.TRADITIONAL, UpDownSpecification.BINOMIAL_BLACK_SCHOLES)
+    leisen_reimer = specification_mask(specifications, UpDownSpecification.LEISEN_REIMER)
+    sqrt_dt = np.sqrt(time_delta)
+    if ((up is None) != (down is None)):
+        raise ValueError("up and down must be given together")
+
+    traditional_up = np.exp(volatility*sqrt_dt) if up is None else np.asarray(up, dtype=float)
+    traditional_down = 1/traditional_up if down is None else np.asarray(down, dtype=float)
+    traditional_probability = (np.exp((risk_free_rate - continuous_income_rate)*time_delta) - traditional_down)/(traditional_up - traditional_down)
+
+    drift = (risk_free_rate - continuous_income_rate - (volatility**2)/2)*time_delta
+    alternative_up = np.exp(drift + volatility*sqrt_dt)
+    alternative_down = np.exp(drift - volatility*sqrt_dt)
+
+    up = np.where(traditional, traditional_up, alternative_up)
+    down = np.where(traditional, traditional_down, alternative_down)
+    probability = np.where(traditional, traditional_probability, 0.5)
+
+    if (leisen_reimer.any()):
+        if (present_spot is None or strike_price is None or num_period is None):
+            raise ValueError("Leisen-Reimer lattices need present_spot, strike_price and num_period")
+        with np.errstate(all="ignore"):
+            lr_up, lr_down, lr_probability = leisen_reimer_parameters(present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, time_delta*num_period, num_period)
+        up = np.where(leisen_reimer, lr_up, up)
+        down = np.where(leisen_reimer, lr_down, down)
+        probability = np.where(leisen_reimer, lr_probability, probability)
+    return up, down, probability
+
+
+def smoothing_last_step(specifications, is_call, strike_price, risk_free_rate, continuous_income_rate, volatility, time_delta):
+    # Binomial Black-Scholes: on level N - 1 the continuation value is the closed-form
+    # one-period European value instead of the discounted lattice payoff.
+    smoothed = specification_mask(specifications, UpDownSpecification.BINOMIAL_BLACK_SCHOLES)
+    if (not smoothed.any()):
+        return None
+    from .black_scholes_engine import bsm_value
+    sign = np.where(is_call, 1.0, -1.0)[..., None]
+    smoothed = smoothed[..., None]
+    strike, rate, income_rate, vol, tenure = [np.asarray(value, dtype=float)[..., None] for value in (strike_price, risk_free_rate, continuous_income_rate, volatility, time_delta)]
+
+    # base_spot is the spot net of remaining payments; the payment still outstanding at
+    # expiry is moved onto the strike so the one-period payoff is unchanged.
+    def last_step(base_spot, values, terminal_payment):
+        with np.errstate(all="ignore"):
+            one_period = bsm_value(sign, base_spot, strike - terminal_payment, rate, income_rate, vol, tenure)
+        return np.where(smoothed, one_period, values)
+    return last_step
+
+
+# Contract arrays may carry any leading shape (e.g. bump scenarios x contracts); the
+# lattice nodes run along a trailing axis. Arrays that do not change across a leading
+# axis can be passed with length 1 there and are broadcast rather than copied.
+# payment_values, when given, holds the PV of remaining payments per level on a trailing
+# axis of num_period + 1 and present_spot is then the spot net of the level-0 PV.
+def batch_backward_induction(present_spot, strike_price, up, down, probability, discount, num_period, is_call, is_american, payment_values=None, head_levels=0, last_step=None):
+    sign = np.where(is_call, 1.0, -1.0)[..., None]
+    strike = np.asarray(strike_price)[..., None]
+    up = np.asarray(up)[..., None]
+    down = np.asarray(down)[..., None]
+    up_weight = (discount*probability)[..., None]
+    down_weight = (discount*(1 - probability))[..., None]
+    exercise_floor = np.where(is_american, 0.0, -np.inf)[..., None]
+    any_american = bool(np.any(is_american))
+    payments = None if payment_values is None else np.asarray(payment_values, dtype=float)
+
+    present_spot = np.asarray(present_spot)[..., None]
+    levels = np.arange(num_period + 1)
+    base = present_spot*up**(num_period - levels)*down**levels
+    spot = base if payments is None else base + payments[..., num_period:num_period + 1]
+    values = np.maximum(sign*(spot - strike), 0)
+    heads = {}
+    if (num_period < head_levels):
+        heads[num_period] = (spot, values)
+
+    for level in range(num_period - 1, -1, -1):
+        values = up_weight*values[..., :level + 1] + down_weight*values[..., 1:level + 2]
+        smoothing_level = last_step is not None and level == num_period - 1
+        if (any_american):
+            base = base[..., :level + 1]/up
+        elif (level < head_levels or smoothing_level):
+            base = present_spot*up**(level - levels[:level + 1])*down**levels[:level + 1]
+        if (any_american or level < head_levels):
+            spot = base if payments is None else base + payments[..., level:level + 1]
+        if (smoothing_level):
+            values = last_step(base, values, 0.0 if payments is None else payments[..., num_period:num_period + 1])
+        if (any_american):
+            np.maximum(values, sign*(spot - strike) + exercise_floor, out=values)
+        if (level < head_levels):
+            heads[level] = (spot, values)
+    if (head_levels):
+        return values[..., 0], heads
+    return values[..., 0]
+
+
+# payment_values, when given, holds the PV of each contract's remaining discrete payments
+# per lattice level, shape (contracts, num_period + 1) or (num_period + 1,) for all; the
+# payments are escrowed out of the spot as in Binomial_Lattice_Tree_Interval. up and down,
+# when given, set the TRADITIONAL and BINOMIAL_BLACK_SCHOLES spacing per contract.
+def price_contracts(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, chunk_size=DEFAULT_CHUNK_SIZE, instrumentation=None, payment_values=None, up=None, down=None):
+    specifications, options, arrays = contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure = arrays
+    size = present_spot.shape[0]
+    if (np.any(tenure < 0)):
+        raise ValueError("tenure must not be negative")
+    if (payment_values is not None):
+        payment_values = np.broadcast_to(np.asarray(payment_values, dtype=float), (size, num_period + 1))
+    if ((up is None) != (down is None)):
+        raise ValueError("up and down must be given together")
+    if (up is not None):
+        up, down = [np.broadcast_to(np.asarray(value, dtype=float), (size,)) for value in (up, down)]
+
+    # Expiring contracts are worth their intrinsic value; the lattice step would be zero.
+    expired = tenure == 0
+    if (expired.any()):
+        prices = np.empty(size)
+        is_call, _ = option_flags(options[expired])
+        prices[expired] = np.maximum(np.where(is_call, 1.0, -1.0)*(present_spot[expired] - strike_price[expired]), 0)
+        live = ~expired
+        if (live.any()):
+            prices[live] = price_contracts(specifications[live], options[live], *[values[live] for values in arrays], num_period, chunk_size=chunk_size, instrumentation=instrumentation, payment_values=None if payment_values is None else payment_values[live], up=None if up is None else up[live], down=None if down is None else down[live])
+        return prices
+
+    if (instrumentation != None):
+        started = instrumentation.start()
+    is_call, is_american = option_flags(options)
+    time_delta = tenure/num_period
+    base_spot = present_spot if payment_values is None else present_spot - payment_values[:, 0]
+    base_strike = strike_price if payment_values is None else strike_price - payment_values[:, -1]
+    up, down, probability = lattice_parameters(specifications, risk_free_rate, continuous_income_rate, volatility, time_delta, base_spot, base_strike, num_period, up, down)
+    discount = np.exp(-1*risk_free_rate*time_delta)
+    if (instrumentation != None):
+        instrumentation.stop("batch_parameters", started, contracts=size)
+
+    prices = np.empty(size)
+    for start in range(0, size, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        if (instrumentation != None):
+            started = instrumentation.start()
+        last_step = smoothing_last_step(specifications[chunk], is_call[chunk], strike_price[chunk], risk_free_rate[chunk], continuous_income_rate[chunk], volatility[chunk], time_delta[chunk])
+        prices[chunk] = batch_backward_induction(base_spot[chunk], strike_price[chunk], up[chunk], down[chunk], probability[chunk], discount[chunk], num_period, is_call[chunk], is_american[chunk], None if payment_values is None else payment_values[chunk], last_step=last_step)
+        if (instrumentation != None):
+            contracts = prices[chunk].shape[0]
+            # The kernel holds a spot and a value vector of N + 1 nodes per contract.
+            instrumentation.stop("batch_backward_induction", started, contracts=contracts, nodes=contracts*lattice_node_count(num_period), bytes=2*contracts*(num_period + 1)*prices.itemsize)
+    return prices
+
+
+def price_frame(frame, num_period, chunk_size=DEFAULT_CHUNK_SIZE, instrumentation=None):
+    missing = [column for column in FRAME_COLUMNS if column not in frame.columns]
+    if (missing):
+        raise ValueError("missing contract columns: {0}".format(", ".join(missing)))
+    return price_contracts(*[frame[column].to_numpy() for column in FRAME_COLUMNS], num_period, chunk_size=chunk_size, instrumentation=instrumentation)
@@ -0,0 +1,261 @@
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from .lattice_engine import UpDownSpecification, OptionType, Recombining_Lattice, Lattice_Skeleton, payment_present_values
+from .lattice_batch import price_contracts
+from .black_scholes_engine import bsm_price
+from .lattice_cli import value_file
+from . import lattice_tree, lattice_interval
+
+# Directory holding the package, used as the working directory of startup subprocesses.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TREE_PERIODS = (4, 8, 12, 16)
+LATTICE_PERIODS = (100, 500, 1000, 5000)
+BATCH_SIZES = (100, 1000, 10000, 100000)
+BATCH_PERIODS = 100
+DIVIDEND_COUNTS = (0, 4, 16, 64)
+DIVIDEND_PERIODS = 500
+CONVERGENCE_PERIODS = (25, 51, 101, 201, 401)
+REFERENCE_PERIODS = 20001
+CLI_CONTRACTS = 20000
+CLI_PERIODS = 100
+STARTUP_COMMANDS = {
+    "import_package": ["-c", "import binomial_lattice"],
+    "import_engine": ["-c", "import binomial_lattice; binomial_lattice.price_contracts"],
+    "cli_help": ["-m", "binomial_lattice", "--help"],
+}
+DEFAULT_REPEAT = 3
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+# Timings below this are dominated by noise and are not compared against a baseline.
+MINIMUM_COMPARED_SECONDS = 0.001
+
+CONTRACT = {"present_spot": 100.0, "strike_price": 105.0, "risk_free_rate": 0.05, "continuous_income_rate": 0.02, "volatility": 0.25, "tenure": 1.0}
+
+PRICE_METHODS = {
+    OptionType.EUROPEAN_CALL: "calculate_european_call_price",
+    OptionType.AMERICAN_CALL: "calculate_american_call_price",
+    OptionType.EUROPEAN_PUT: "calculate_european_put_price",
+    OptionType.AMERICAN_PUT: "calculate_american_put_price",
+}
+
+
+def measure(function, repeat):
+    # Best wall time over repeat runs, then one traced run for the peak allocation so
+    # tracemalloc overhead does not leak into the timings.
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"seconds": best, "peak_bytes": peak}
+
+
+def lattice_inputs(num_period):
+    time_delta = CONTRACT["tenure"]/num_period
+    up = math.exp(CONTRACT["volatility"]*math.sqrt(time_delta))
+    down = 1/up
+    probability = (math.exp((CONTRACT["risk_free_rate"] - CONTRACT["continuous_income_rate"])*time_delta) - down)/(up - down)
+    return time_delta, up, down, probability
+
+
+def reference_prices():
+    # Closed form for European contracts, a high-N Leisen-Reimer lattice for American ones.
+    contract = tuple(CONTRACT.values())
+    references = {}
+    for option in OptionType:
+        if (option in (OptionType.EUROPEAN_CALL, OptionType.EUROPEAN_PUT)):
+            references[option] = float(bsm_price(option, *contract)[0])
+        else:
+            references[option] = float(price_contracts(UpDownSpecification.LEISEN_REIMER, option, *contract, REFERENCE_PERIODS)[0])
+    return references
+
+
+def benchmark_tree_construction(scripts, repeat):
+    results = []
+    for num_period in TREE_PERIODS:
+        _, up, down, _ = lattice_inputs(num_period)
+        _, stats = measure(lambda: scripts["lattice"].Lattice_Node(CONTRACT["present_spot"], up, down, num_period, None), repeat)
+        results.append(dict(benchmark="construction", builder="Lattice_Node", num_period=num_period, **stats))
+        _, stats = measure(lambda: scripts["interval"].Lattice_Node_Interval(CONTRACT["present_spot"], up, down, num_period, None, None), repeat)
+        results.append(dict(benchmark="construction", builder="Lattice_Node_Interval", num_period=num_period, **stats))
+    # Recombining_Lattice only stores its inputs when built; the spot grids it walks during
+    # induction are what Lattice_Skeleton precomputes, so that is the construction timed.
+    for num_period in TREE_PERIODS + LATTICE_PERIODS:
+        time_delta, up, down, probability = lattice_inputs(num_period)
+        _, stats = measure(lambda: Lattice_Skeleton(CONTRACT["present_spot"], up, down, num_period, CONTRACT["risk_free_rate"], time_delta, probability), repeat)
+        results.append(dict(benchmark="construction", builder="Lattice_Skeleton", num_period=num_period, **stats))
+    return results
+
+
+def benchmark_price_methods(scripts, references, repeat):
+    results = []
+    builders = {
+        "Lattice_Node": lambda num_period, up, down: scripts["lattice"].Lattice_Node(CONTRACT["present_spot"], up, down, num_period, None),
+        "Lattice_Node_Interval": lambda num_period, up, down: scripts["interval"].Lattice_Node_Interval(CONTRACT["present_spot"], up, down, num_period, None, None),
+        "Recombining_Lattice": lambda num_period, up, down: Recombining_Lattice(CONTRACT["present_spot"], up, down, num_period),
+    }
+    for builder, build in builders.items():
+        periods = LATTICE_PERIODS if builder == "Recombining_Lattice" else TREE_PERIODS
+        for num_period in periods:
+            time_delta, up, down, probability = lattice_inputs(num_period)
+            tree = build(num_period, up, down)
+            for option, method_name in PRICE_METHODS.items():
+                method = getattr(tree, method_name)
+                price, stats = measure(lambda: method(CONTRACT["strike_price"], probability, CONTRACT["risk_free_rate"], time_delta), repeat)
+                results.append(dict(benchmark="price_method", builder=builder, method=method_name, num_period=num_period, price=price, error=price - references[option], **stats))
+    return results
+
+
+def benchmark_batch(repeat):
+    results = []
+    generator = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        spots = CONTRACT["present_spot"]*generator.uniform(0.8, 1.2, size)
+        for option in (OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT):
+            _, stats = measure(lambda: price_contracts(UpDownSpecification.TRADITIONAL, option, spots, CONTRACT["strike_price"], CONTRACT["risk_free_rate"], CONTRACT["continuous_income_rate"], CONTRACT["volatility"], CONTRACT["tenure"], BATCH_PERIODS), repeat)
+            results.append(dict(benchmark="batch", option=option.name, contracts=size, num_period=BATCH_PERIODS, contracts_per_second=size/stats["seconds"], **stats))
+    return results
+
+
+def benchmark_dividends(scripts, repeat):
+    results = []
+    interval = scripts["interval"]
+    time_delta, up, down, _ = lattice_inputs(DIVIDEND_PERIODS)
+    for count in DIVIDEND_COUNTS:
+        payments = [interval.Payment(CONTRACT["tenure"]*(index + 1)/(count + 1), 0.5, CONTRACT["risk_free_rate"]) for index in range(count)]
+        _, stats = measure(lambda: payment_present_values(payments, CONTRACT["risk_free_rate"], time_delta, DIVIDEND_PERIODS), repeat)
+        results.append(dict(benchmark="dividends", stage="payment_present_values", payments=count, num_period=DIVIDEND_PERIODS, **stats))
+        _, stats = measure(lambda: interval.Discrete_Payment_Node(0, time_delta, DIVIDEND_PERIODS, CONTRACT["risk_free_rate"], payments), repeat)
+        results.append(dict(benchmark="dividends", stage="Discrete_Payment_Node", payments=count, num_period=DIVIDEND_PERIODS, **stats))
+        payment_values = payment_present_values(payments, CONTRACT["risk_free_rate"], time_delta, DIVIDEND_PERIODS)
+        result, stats = measure(lambda: interval.Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, CONTRACT["present_spot"], CONTRACT["strike_price"], CONTRACT["risk_free_rate"], up, down, CONTRACT["tenure"], DIVIDEND_PERIODS, CONTRACT["continuous_income_rate"], CONTRACT["volatility"], None, payment_values=payment_values).result, repeat)
+        results.append(dict(benchmark="dividends", stage="Binomial_Lattice_Tree_Interval", payments=count, num_period=DIVIDEND_PERIODS, price=result.price, **stats))
+    return results
+
+
+def benchmark_startup(repeat):
+    # Fresh interpreters, so the timings include every import a short-lived job would pay.
+    results = []
+    for name, command in STARTUP_COMMANDS.items():
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + command, cwd=ROOT_DIR, check=True, stdout=subprocess.DEVNULL)
+            best = min(best, time.perf_counter() - start)
+        # A separate -X importtime run lists every module the command imported.
+        probe = subprocess.run([sys.executable, "-X", "importtime"] + command, cwd=ROOT_DIR, check=True, capture_output=True, text=True)
+        results.append(dict(benchmark="startup", command=name, seconds=best, pandas_loaded=" pandas\n" in probe.stderr))
+    return results
+
+
+def benchmark_cli(repeat):
+    # File-to-file throughput of the batch CLI, including the CSV read and write.
+    import pandas as pd
+    generator = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "specification": UpDownSpecification.TRADITIONAL.name,
+        "option": generator.choice([option.name for option in OptionType], CLI_CONTRACTS),
+        "present_spot": CONTRACT["present_spot"]*generator.uniform(0.8, 1.2, CLI_CONTRACTS),
+        "strike_price": CONTRACT["strike_price"],
+        "risk_free_rate": CONTRACT["risk_free_rate"],
+        "continuous_income_rate": CONTRACT["continuous_income_rate"],
+        "volatility": CONTRACT["volatility"],
+        "tenure": CONTRACT["tenure"],
+    })
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "contracts.csv")
+        frame.to_csv(input_path, index=False)
+        summary, stats = measure(lambda: value_file(input_path, os.path.join(directory, "prices.csv"), CLI_PERIODS), repeat)
+    return [dict(benchmark="cli", format="csv", contracts=summary["contracts"], num_period=CLI_PERIODS, contracts_per_second=summary["contracts"]/stats["seconds"], **stats)]
+
+
+def benchmark_convergence(references, repeat):
+    results = []
+    contract = tuple(CONTRACT.values())
+    for specification in UpDownSpecification:
+        for option in (OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT):
+            for num_period in CONVERGENCE_PERIODS:
+                price, stats = measure(lambda: float(price_contracts(specification, option, *contract, num_period)[0]), repeat)
+                results.append(dict(benchmark="convergence", specification=specification.name, option=option.name, num_period=num_period, price=price, error=price - references[option], **stats))
+    return results
+
+
+def run_benchmarks(repeat=DEFAULT_REPEAT):
+    scripts = {"lattice": lattice_tree, "interval": lattice_interval}
+    references = reference_prices()
+    results = []
+    results.extend(benchmark_tree_construction(scripts, repeat))
+    results.extend(benchmark_price_methods(scripts, references, repeat))
+    results.extend(benchmark_batch(repeat))
+    results.extend(benchmark_dividends(scripts, repeat))
+    results.extend(benchmark_convergence(references, repeat))
+    results.extend(benchmark_startup(repeat))
+    results.extend(benchmark_cli(repeat))
+    return {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "contract": CONTRACT,
+            "references": {option.name: price for option, price in references.items()},
+        },
+        "results": results,
+    }
+
+
+def result_key(result):
+    return tuple(sorted((name, value) for name, value in result.items() if isinstance(value, (str, int)) and not isinstance(value, bool)))
+
+
+def find_regressions(report, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    # A benchmark regresses when it is slower than threshold times its baseline timing.
+    baseline_seconds = {result_key(result): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        previous = baseline_seconds.get(result_key(result))
+        if (previous and previous >= MINIMUM_COMPARED_SECONDS and result["seconds"] > threshold*previous):
+            regressions.append(dict(result, baseline_seconds=previous, ratio=result["seconds"]/previous))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and check the accuracy of the lattice builders and pricers.")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--baseline", help="earlier JSON report to compare timings against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    arguments = parser.parse_args()
+
+    report = run_benchmarks(arguments.repeat)
+    if (arguments.baseline):
+        with open(arguments.baseline) as baseline_file:
+            report["regressions"] = find_regressions(report, json.load(baseline_file), arguments.threshold)
+
+    if (arguments.output):
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    if (report.get("regressions")):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
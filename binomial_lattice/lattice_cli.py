@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import time
+from .lattice_batch import DEFAULT_CHUNK_SIZE, price_frame
+
+DEFAULT_NUM_PERIOD = 500
+DEFAULT_READ_ROWS = 100000
+FILE_FORMATS = ("csv", "parquet")
+
+
+def file_format(path, file_format=None):
+    if (file_format != None):
+        return file_format
+    return "parquet" if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else "csv"
+
+
+def read_contracts(path, file_format, read_rows):
+    # Contracts are streamed read_rows at a time, so input size is bounded by disk, not memory.
+    if (file_format == "parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=read_rows):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        for frame in pd.read_csv(path, chunksize=read_rows):
+            yield frame
+
+
+# Appends one priced chunk at a time: the CSV header is written with the first chunk and
+# Parquet chunks become row groups of a single file.
+class Result_Writer:
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self.parquet_writer = None
+        self.rows = 0
+
+    def write(self, frame):
+        if (self.file_format == "parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if (self.parquet_writer == None):
+                self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows = self.rows + len(frame)
+
+    def close(self):
+        if (self.parquet_writer != None):
+            self.parquet_writer.close()
+
+
+def value_file(input_path, output_path, num_period=DEFAULT_NUM_PERIOD, chunk_size=DEFAULT_CHUNK_SIZE, read_rows=DEFAULT_READ_ROWS, input_format=None, output_format=None, instrumentation=None):
+    # Prices every contract of input_path with the batch engine and writes the input columns
+    # plus a price column to output_path. Returns the row count and the wall time.
+    input_format = file_format(input_path, input_format)
+    output_format = file_format(output_path, output_format)
+    if (input_format not in FILE_FORMATS or output_format not in FILE_FORMATS):
+        raise ValueError("file formats must be one of: {0}".format(", ".join(FILE_FORMATS)))
+    started = time.perf_counter()
+    writer = Result_Writer(output_path, output_format)
+    try:
+        for frame in read_contracts(input_path, input_format, read_rows):
+            frame["price"] = price_frame(frame, num_period, chunk_size=chunk_size, instrumentation=instrumentation)
+            writer.write(frame)
+    finally:
+        writer.close()
+    return {"contracts": writer.rows, "seconds": time.perf_counter() - started}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m binomial_lattice", description="Price a file of contracts with the batch lattice engine.")
+    parser.add_argument("input", help="CSV or Parquet file with the columns specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure")
+    parser.add_argument("output", help="CSV or Parquet file to write the contracts and their prices to")
+    parser.add_argument("--num-period", type=int, default=DEFAULT_NUM_PERIOD)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="contracts per backward induction")
+    parser.add_argument("--read-rows", type=int, default=DEFAULT_READ_ROWS, help="rows read and written per chunk")
+    parser.add_argument("--input-format", choices=FILE_FORMATS, help="defaults to the input file extension")
+    parser.add_argument("--output-format", choices=FILE_FORMATS, help="defaults to the output file extension")
+    parser.add_argument("--metrics", help="write per-phase timings here in Prometheus text format")
+    arguments = parser.parse_args(arguments)
+
+    instrumentation = None
+    if (arguments.metrics):
+        from .lattice_instrumentation import Pricing_Instrumentation, Prometheus_Sink
+        sink = Prometheus_Sink()
+        instrumentation = Pricing_Instrumentation(sink)
+    summary = value_file(arguments.input, arguments.output, arguments.num_period, arguments.chunk_size, arguments.read_rows, arguments.input_format, arguments.output_format, instrumentation)
+    if (instrumentation != None):
+        sink.write(arguments.metrics)
+    sys.stderr.write("priced {0} contracts in {1:.3f}s ({2:.0f} contracts/s)\n".format(summary["contracts"], summary["seconds"], summary["contracts"]/summary["seconds"] if summary["seconds"] else 0))
+
+
+if __name__ == "__main__":
+    main()
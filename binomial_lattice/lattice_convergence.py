@@ -0,0 +1,92 @@
+import numpy as np
+from .lattice_engine import UpDownSpecification, OptionType
+from .lattice_batch import DEFAULT_CHUNK_SIZE, contract_arrays, option_flags, price_contracts
+
+# Leading order of the lattice discretisation error in 1/N of European contracts for the
+# specifications whose error is smooth in N. TRADITIONAL and ALTERNATIVE errors oscillate
+# with the strike's position between nodes, so neither extrapolation nor a stopping rule
+# on successive estimates is reliable for them.
+CONVERGENCE_ORDER = {
+    UpDownSpecification.LEISEN_REIMER: 2,
+    UpDownSpecification.BINOMIAL_BLACK_SCHOLES: 1,
+}
+# The early-exercise boundary moves between nodes as N grows, so American errors are only
+# first order and irregular in N whatever the specification.
+AMERICAN_CONVERGENCE_ORDER = 1
+
+DEFAULT_TOLERANCE = 1e-4
+DEFAULT_START_PERIOD = 25
+DEFAULT_MAX_PERIOD = 6401
+# Successive estimates must agree on this many refinements in a row before a contract stops.
+SETTLING_PASSES = 2
+
+
+def _contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure):
+    specifications, options, arrays = contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    unsupported = sorted(set(value.name for value in specifications if value not in CONVERGENCE_ORDER))
+    if (unsupported):
+        raise ValueError("extrapolation needs a smoothly converging specification (LEISEN_REIMER or BINOMIAL_BLACK_SCHOLES), got: {0}".format(", ".join(unsupported)))
+    return [specifications, options] + arrays
+
+
+def refined_period(num_period):
+    # Doubling while keeping odd step counts odd, which Leisen-Reimer lattices rely on.
+    return 2*num_period + num_period % 2
+
+
+def convergence_order(specifications, options):
+    _, is_american = option_flags(options)
+    order = np.array([CONVERGENCE_ORDER[specification] for specification in specifications], dtype=float)
+    return np.where(is_american, AMERICAN_CONVERGENCE_ORDER, order)
+
+
+def _extrapolate(specifications, options, coarse, fine, num_period, fine_period):
+    # Two-point extrapolation removing the leading error term c/N^k of each contract.
+    order = convergence_order(specifications, options)
+    fine_weight = float(fine_period)**order
+    coarse_weight = float(num_period)**order
+    return (fine_weight*fine - coarse_weight*coarse)/(fine_weight - coarse_weight)
+
+
+def richardson_price(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Extrapolates price(N) and price(M), M ~ 2N, with k taken from convergence_order.
+    contract = _contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    fine_period = refined_period(num_period)
+    coarse = price_contracts(*contract, num_period, chunk_size=chunk_size)
+    fine = price_contracts(*contract, fine_period, chunk_size=chunk_size)
+    return _extrapolate(contract[0], contract[1], coarse, fine, num_period, fine_period)
+
+
+def price_to_tolerance(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, tolerance=DEFAULT_TOLERANCE, start_period=DEFAULT_START_PERIOD, max_period=DEFAULT_MAX_PERIOD, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Refines N per contract until successive Richardson estimates agree to within
+    # tolerance (in price units) on SETTLING_PASSES refinements in a row; contracts that
+    # have converged drop out of later passes.
+    # Each pass reuses the previous fine prices as its coarse leg, so it prices one new N.
+    # Returns the prices, the coarse step count used for each contract, and a converged flag.
+    contract = _contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    size = contract[2].shape[0]
+    num_period = start_period
+    fine_period = refined_period(num_period)
+    coarse = price_contracts(*contract, num_period, chunk_size=chunk_size)
+    fine = price_contracts(*contract, fine_period, chunk_size=chunk_size)
+    prices = _extrapolate(contract[0], contract[1], coarse, fine, num_period, fine_period)
+    periods = np.full(size, start_period)
+    converged = np.zeros(size, dtype=bool)
+    agreements = np.zeros(size, dtype=int)
+    pending = np.arange(size)
+
+    while (pending.size and refined_period(fine_period) <= max_period):
+        num_period = fine_period
+        fine_period = refined_period(num_period)
+        pending_contract = [values[pending] for values in contract]
+        coarse = fine
+        fine = price_contracts(*pending_contract, fine_period, chunk_size=chunk_size)
+        estimate = _extrapolate(pending_contract[0], pending_contract[1], coarse, fine, num_period, fine_period)
+        agreements[pending] = np.where(np.abs(estimate - prices[pending]) <= tolerance, agreements[pending] + 1, 0)
+        settled = agreements[pending] >= SETTLING_PASSES
+        prices[pending] = estimate
+        periods[pending] = num_period
+        converged[pending[settled]] = True
+        pending = pending[~settled]
+        fine = fine[~settled]
+    return prices, periods, converged
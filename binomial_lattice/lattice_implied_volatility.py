@@ -0,0 +1,84 @@
+import numpy as np
+from enum import Enum
+from .lattice_batch import contract_arrays, option_flags, lattice_parameters, smoothing_last_step, batch_backward_induction
+from .black_scholes_engine import bsm_implied_volatility
+
+DEFAULT_PRICE_TOLERANCE = 1e-6
+DEFAULT_VOLATILITY_TOLERANCE = 1e-7
+DEFAULT_MAX_ITERATIONS = 50
+DEFAULT_LOWER_VOLATILITY = 1e-4
+DEFAULT_UPPER_VOLATILITY = 5.0
+VEGA_BUMP = 1e-4
+
+
+class Implied_Volatility_Status (Enum):
+    CONVERGED = 1
+    MAX_ITERATIONS = 2
+    PRICE_BELOW_RANGE = 3
+    PRICE_ABOVE_RANGE = 4
+
+
+def _price_and_vega(specifications, is_call, is_american, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period):
+    # Base and bumped volatility share one backward induction along a leading scenario axis.
+    volatilities = np.stack([volatility, volatility + VEGA_BUMP])
+    time_delta = tenure/num_period
+    up, down, probability = lattice_parameters(specifications, risk_free_rate, continuous_income_rate, volatilities, time_delta, present_spot, strike_price, num_period)
+    last_step = smoothing_last_step(specifications, is_call, strike_price, risk_free_rate, continuous_income_rate, volatilities, time_delta)
+    prices = batch_backward_induction(present_spot[None], strike_price[None], up, down, probability, np.exp(-1*risk_free_rate*time_delta), num_period, is_call[None], is_american[None], last_step=last_step)
+    return prices[0], (prices[1] - prices[0])/VEGA_BUMP
+
+
+def implied_volatility(specification, option, market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure, num_period, price_tolerance=DEFAULT_PRICE_TOLERANCE, volatility_tolerance=DEFAULT_VOLATILITY_TOLERANCE, max_iterations=DEFAULT_MAX_ITERATIONS, lower=DEFAULT_LOWER_VOLATILITY, upper=DEFAULT_UPPER_VOLATILITY):
+    # Safeguarded Newton iteration on the lattice price, seeded from the closed-form BSM
+    # implied volatility. Every contract keeps a bracket [low, high] that the evaluated
+    # prices tighten; a Newton step that leaves the bracket, or a vanishing vega, falls
+    # back to bisection. Only contracts still iterating are repriced on each pass.
+    specifications, options, arrays = contract_arrays(specification, option, market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure)
+    market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure = [np.array(values) for values in arrays]
+    size = market_price.shape[0]
+    is_call, is_american = option_flags(options)
+
+    volatility = bsm_implied_volatility(options, market_price, present_spot, strike_price, risk_free_rate, continuous_income_rate, tenure, lower, upper)
+    low = np.full(size, lower)
+    high = np.full(size, upper)
+    iterations = np.zeros(size, dtype=int)
+    status = np.full(size, Implied_Volatility_Status.MAX_ITERATIONS, dtype=object)
+    active = np.arange(size)
+
+    for _ in range(max_iterations):
+        if (not active.size):
+            break
+        contract = [values[active] for values in (specifications, is_call, is_american, present_spot, strike_price, risk_free_rate, continuous_income_rate)]
+        current = volatility[active]
+        price, vega = _price_and_vega(*contract, current, tenure[active], num_period)
+        difference = price - market_price[active]
+        iterations[active] = iterations[active] + 1
+
+        # Lattice prices rise with volatility, so the sign of the error moves one bracket end.
+        current_high = np.where(difference > 0, current, high[active])
+        current_low = np.where(difference < 0, current, low[active])
+        high[active] = current_high
+        low[active] = current_low
+
+        with np.errstate(all="ignore"):
+            newton = current - difference/vega
+        bisect = ~np.isfinite(newton) | (vega <= 0) | (newton <= current_low) | (newton >= current_high)
+        volatility[active] = np.where(bisect, 0.5*(current_low + current_high), newton)
+
+        converged = np.abs(difference) <= price_tolerance
+        collapsed = ~converged & (current_high - current_low <= volatility_tolerance)
+        below_range = collapsed & (current_high - lower <= volatility_tolerance)
+        above_range = collapsed & (upper - current_low <= volatility_tolerance)
+        volatility[active[converged]] = current[converged]
+        status[active[converged | (collapsed & ~below_range & ~above_range)]] = Implied_Volatility_Status.CONVERGED
+        status[active[below_range]] = Implied_Volatility_Status.PRICE_BELOW_RANGE
+        status[active[above_range]] = Implied_Volatility_Status.PRICE_ABOVE_RANGE
+        active = active[~(converged | collapsed)]
+
+    succeeded = np.array([value == Implied_Volatility_Status.CONVERGED for value in status], dtype=bool)
+    return {
+        "volatility": np.where(succeeded, volatility, np.nan),
+        "iterations": iterations,
+        "converged": succeeded,
+        "status": status,
+    }
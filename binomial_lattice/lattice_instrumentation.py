@@ -0,0 +1,63 @@
+import logging
+import time
+
+# Pricing code holds None when instrumentation is disabled and only tests for it, so a
+# disabled pipeline does no timing, counting or sink calls. An enabled one emits one event
+# dict per phase ({"phase": ..., "seconds": ..., plus counts such as nodes, bytes or
+# cache_hits}) to its sink, which is any callable taking that dict.
+class Pricing_Instrumentation:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, phase, started, **fields):
+        event = {"phase": phase, "seconds": time.perf_counter() - started}
+        event.update(fields)
+        self.sink(event)
+
+
+def lattice_node_count(num_period, recombining=True):
+    return (num_period + 1)*(num_period + 2)//2 if recombining else 2**(num_period + 1) - 1
+
+
+def logging_sink(logger=None, level=logging.INFO):
+    logger = logger if logger != None else logging.getLogger("lattice")
+
+    def sink(event):
+        logger.log(level, " ".join("%s=%s" % (name, value) for name, value in event.items()))
+    return sink
+
+
+# Accumulates events into per-phase counters and renders them in the Prometheus text
+# exposition format, e.g. for a textfile collector or a scrape endpoint.
+class Prometheus_Sink:
+    def __init__(self, prefix="lattice"):
+        self.prefix = prefix
+        self.counters = {}
+
+    def _add(self, metric, phase, value):
+        series = self.counters.setdefault(metric, {})
+        series[phase] = series.get(phase, 0) + value
+
+    def __call__(self, event):
+        phase = event["phase"]
+        self._add("phase_seconds_total", phase, event["seconds"])
+        self._add("phase_calls_total", phase, 1)
+        for name, value in event.items():
+            if (name not in ("phase", "seconds") and isinstance(value, (int, float)) and not isinstance(value, bool)):
+                self._add(name + "_total", phase, value)
+
+    def render(self):
+        lines = []
+        for metric, series in self.counters.items():
+            name = self.prefix + "_" + metric
+            lines.append("# TYPE %s counter" % name)
+            for phase, value in series.items():
+                lines.append('%s{phase="%s"} %r' % (name, phase, value))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        with open(path, "w") as metrics_file:
+            metrics_file.write(self.render())
@@ -0,0 +1,264 @@
+import numpy as np
+import math
+from datetime import datetime, timedelta
+from enum import Enum
+from .lattice_engine import UpDownSpecification, OptionType, Lattice_Backend, Lattice_Result, Recombining_Lattice, leisen_reimer_parameters, payment_present_values, payment_values_from_node, write_nodes
+from .black_scholes_engine import bsm_value
+from .greeks_engine import lattice_greeks, middle_node_theta, BUMP_SCENARIOS
+from .lattice_instrumentation import lattice_node_count
+
+class Payment:
+    def __init__(self, time, amount, rate):
+        self.time = time
+        self.amount = amount
+        self.rate = rate
+
+# The PV of remaining payments depends only on time, so the up and down children are
+# the same node and the whole structure is a chain of periods_left + 1 nodes.
+class Discrete_Payment_Node:
+    def __init__(self, time, time_delta, periods_left, rate, payments, values=None, instrumentation=None):
+        self.time = time
+        self.values = payment_present_values(payments, rate, time_delta, periods_left, time, instrumentation) if values is None else values
+        self.value = self.values[0]
+        self.up_child = None
+        self.down_child = None
+        node = self
+        for level in range(1, periods_left + 1):
+            child = Discrete_Payment_Node(time + level*time_delta, time_delta, 0, rate, payments, self.values[level:])
+            node.up_child = child
+            node.down_child = child
+            node = child
+
+
+
+class Lattice_Node_Interval:
+    def __init__(self, present_value, up, down, levels_outstanding, parent, paymentNode):
+        self.parent = parent
+        if (paymentNode != None):
+            self.present_value = present_value + paymentNode.value
+            next_up_value = (self.present_value - paymentNode.value)*up
+            next_down_value = (self.present_value - paymentNode.value)*down
+        else:
+            self.present_value = present_value
+            next_up_value = (self.present_value)*up
+            next_down_value = (self.present_value)*down
+        if (levels_outstanding > 0):
+            if (paymentNode != None):
+                self.up_child = Lattice_Node_Interval(next_up_value, up, down, levels_outstanding - 1, self, paymentNode.up_child)
+                self.down_child = Lattice_Node_Interval(next_down_value, up, down, levels_outstanding - 1, self, paymentNode.down_child)
+            else:
+                self.up_child = Lattice_Node_Interval(present_value*up, up, down, levels_outstanding - 1, self, None)
+                self.down_child = Lattice_Node_Interval(present_value*down, up, down, levels_outstanding - 1, self, None)
+        else:
+            self.up_child = None
+            self.down_child = None
+    def calculate_european_call_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            self.option_value = max(self.present_value - strike_price, 0)
+        else:
+            self.option_value = (((risk_neutral_probability)*(self.up_child.calculate_european_call_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_european_call_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t))
+        return self.option_value
+    
+    def calculate_american_call_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            self.option_value = max(self.present_value - strike_price, 0)
+        else:
+            self.option_value = max((((risk_neutral_probability)*(self.up_child.calculate_american_call_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_american_call_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t)), self.present_value - strike_price, 0)
+        return self.option_value
+
+    def calculate_european_put_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            self.option_value = max(strike_price - self.present_value, 0)
+        else:
+            self.option_value = (((risk_neutral_probability)*(self.up_child.calculate_european_put_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_european_put_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t))
+        return self.option_value
+
+    def calculate_american_put_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            self.option_value = max(strike_price - self.present_value, 0)
+        else:
+            self.option_value = max((((risk_neutral_probability)*(self.up_child.calculate_american_put_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_american_put_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t)), strike_price - self.present_value, 0)
+        return self.option_value
+
+    def collect_nodes(self, parent_identifier, action, node_list, level=0):
+        if (self.down_child != None and self.up_child != None):
+            curr_identifer = parent_identifier + action if parent_identifier and action else 'Base'
+            node = {
+                "identifier": curr_identifer,
+                "value": self.option_value,
+                "spot_value": self.present_value,
+                "parent": parent_identifier,
+                "level": level,
+                "upChild": curr_identifer + "_U",
+                "downChild": curr_identifer + "_D"
+            }
+            node_list.append(node)
+            self.up_child.collect_nodes(curr_identifer, "_U", node_list, level + 1)
+            self.down_child.collect_nodes(curr_identifer, "_D", node_list, level + 1)
+        return node_list
+
+class Binomial_Lattice_Tree_Interval:
+    def __init__(self, specification, option, present_spot, strike_price, risk_free_rate, up, down, tenure, num_period, continuous_income_rate, volatility, paymentNodes, backend=Lattice_Backend.RECOMBINING, node_export=None, node_export_format="csv", payment_values=None, cache=None, instrumentation=None, bumped_greeks=False):
+        self.specification = specification
+        self.option = option
+        self.present_spot = present_spot
+        self.strike_price = strike_price
+        self.risk_free_rate = risk_free_rate
+        self.up = up
+        self.down = down
+        self.tenure = tenure
+        self.num_period = num_period
+        self.continuous_income_rate = continuous_income_rate if continuous_income_rate else 0
+        self.volatility = volatility
+        self.paymentNodes = paymentNodes
+        self.instrumentation = instrumentation
+        if (instrumentation != None):
+            started = instrumentation.start()
+        if (payment_values is not None and paymentNodes == None):
+            payment_values = np.asarray(payment_values, dtype=float)
+            if (payment_values.shape != (self.num_period + 1,)):
+                raise ValueError("payment_values must hold one present value per lattice level")
+            self.paymentNodes = Discrete_Payment_Node(0, self.tenure/self.num_period, self.num_period, 0, [], payment_values)
+        self.backend = backend
+        self.keep_levels = node_export != None
+
+        time_delta = self.tenure/self.num_period
+        payment_values = payment_values_from_node(self.paymentNodes, self.num_period)
+        if (instrumentation != None):
+            # Discounting itself is reported by payment_present_values / Discrete_Payment_Node.
+            instrumentation.stop("payment_lookup", started, levels=self.num_period + 1, bytes=payment_values.nbytes)
+        # self.tree = Lattice_Node_Interval(self.present_spot, self.up, self.down, self.num_period, None, self.paymentNodes)
+
+        if (self.specification == UpDownSpecification.TRADITIONAL):
+            self.risk_neutral_probability = ((math.exp((self.risk_free_rate - self.continuous_income_rate)*time_delta) - self.down)/(self.up - self.down))
+        if (self.specification == UpDownSpecification.ALTERNATIVE):
+            self.risk_neutral_probability = 0.5
+            self.up = math.exp((self.risk_free_rate - self.continuous_income_rate - (self.volatility**2)/2)*time_delta + self.volatility*math.sqrt(time_delta))
+            self.down = math.exp((self.risk_free_rate - self.continuous_income_rate - (self.volatility**2)/2)*time_delta - self.volatility*math.sqrt(time_delta))
+        # Payments are escrowed: the smoothing and Leisen-Reimer steps see the spot net of
+        # remaining payments and a strike net of the payment still outstanding at expiry.
+        if (self.specification == UpDownSpecification.LEISEN_REIMER):
+            up, down, probability = leisen_reimer_parameters(self.present_spot - payment_values[0], self.strike_price - payment_values[-1], self.risk_free_rate, self.continuous_income_rate, self.volatility, self.tenure, self.num_period)
+            self.up = float(up)
+            self.down = float(down)
+            self.risk_neutral_probability = float(probability)
+        last_step = None
+        if (self.specification == UpDownSpecification.BINOMIAL_BLACK_SCHOLES):
+            self.risk_neutral_probability = ((math.exp((self.risk_free_rate - self.continuous_income_rate)*time_delta) - self.down)/(self.up - self.down))
+            sign = 1.0 if option in (OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL) else -1.0
+            last_step = lambda spot: bsm_value(sign, spot - payment_values[-2], self.strike_price - payment_values[-1], self.risk_free_rate, self.continuous_income_rate, self.volatility, time_delta)
+        
+        if (instrumentation != None):
+            started = instrumentation.start()
+            cache_stats = None if cache == None else cache.stats()
+        if (self.backend == Lattice_Backend.RECOMBINING):
+            skeleton = None if cache == None else cache.skeleton(self.present_spot - payment_values[0], self.up, self.down, self.num_period, self.risk_free_rate, time_delta, self.risk_neutral_probability, payment_values)
+            self.tree = Recombining_Lattice(self.present_spot - payment_values[0], self.up, self.down, self.num_period, payment_values, keep_levels=self.keep_levels, skeleton=skeleton, last_step=last_step)
+        elif (last_step != None):
+            raise ValueError("the binomial Black-Scholes specification needs the recombining backend")
+        elif (self.paymentNodes != None):
+            self.tree = Lattice_Node_Interval(self.present_spot - self.paymentNodes.value, self.up, self.down, self.num_period, None, self.paymentNodes)
+        else:
+            self.tree = Lattice_Node_Interval(self.present_spot, self.up, self.down, self.num_period, None, self.paymentNodes)
+        if (instrumentation != None):
+            node_count = lattice_node_count(self.num_period, self.backend == Lattice_Backend.RECOMBINING)
+            cache_fields = {} if cache == None else {"cache_hits": cache.hits - cache_stats["hits"], "cache_misses": cache.misses - cache_stats["misses"]}
+            instrumentation.stop("lattice_construction", started, nodes=node_count, **cache_fields)
+            started = instrumentation.start()
+
+
+        if (option == OptionType.EUROPEAN_CALL):
+            self.price = self.tree.calculate_european_call_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.EUROPEAN_PUT):
+            self.price = self.tree.calculate_european_put_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.AMERICAN_CALL):
+            self.price = self.tree.calculate_american_call_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.AMERICAN_PUT):
+            self.price = self.tree.calculate_american_put_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (instrumentation != None):
+            held = {"bytes": self.tree.retained_bytes()} if self.backend == Lattice_Backend.RECOMBINING else {}
+            instrumentation.stop("backward_induction", started, nodes=node_count, **held)
+        if (node_export != None):
+            self.export_nodes(node_export, node_export_format)
+        # Delta, gamma and theta are read off the priced lattice for free; vega and rho need
+        # a bumped repricing and are only computed when asked for.
+        self.result = self.compute_greeks(bumped_greeks) if self.num_period >= 2 else Lattice_Result(self.price)
+
+    def export_nodes(self, destination, file_format="csv"):
+        if (self.instrumentation != None):
+            started = self.instrumentation.start()
+        if (self.backend == Lattice_Backend.RECOMBINING):
+            node_list = self.tree.collect_nodes()
+        else:
+            node_list = self.tree.collect_nodes(None, 0, [])
+        write_nodes(node_list, destination, file_format)
+        if (self.instrumentation != None):
+            self.instrumentation.stop("export", started, rows=len(node_list), format=file_format)
+    
+    def compute_greeks(self, bumped_greeks=False):
+        if (self.num_period < 2):
+            raise ValueError("lattice Greeks need at least two periods")
+        if (bumped_greeks and self.specification in (UpDownSpecification.TRADITIONAL, UpDownSpecification.BINOMIAL_BLACK_SCHOLES)):
+            # The bumped pass rebuilds up/down from the volatility, so it only reprices the
+            # lattice that was priced when the given up/down are the ones the volatility implies.
+            jump = math.exp(self.volatility*math.sqrt(self.tenure/self.num_period))
+            if (not (math.isclose(self.up, jump, rel_tol=1e-9) and math.isclose(self.down, 1/jump, rel_tol=1e-9))):
+                raise ValueError("vega and rho need up and down equal to exp(+/-volatility*sqrt(time_delta))")
+        if (self.instrumentation != None):
+            started = self.instrumentation.start()
+        if (self.backend == Lattice_Backend.RECOMBINING):
+            values = self.tree.option_values
+            spots = self.tree.spot_values
+            self.delta = (values[1][0] - values[1][1])/(spots[1][0] - spots[1][1])
+            gamma_param1 = (values[2][0] - values[2][1])/(spots[2][0] - spots[2][1])
+            gamma_param2 = (values[2][1] - values[2][2])/(spots[2][1] - spots[2][2])
+            middle_value = values[2][1]
+            middle_offset = spots[2][1] - spots[0][0]
+            spot_spread = spots[2][0] - spots[2][2]
+        else:
+            self.delta = (self.tree.up_child.option_value - self.tree.down_child.option_value)/(self.tree.up_child.present_value - self.tree.down_child.present_value)
+            gamma_param1 = (self.tree.up_child.up_child.option_value - self.tree.up_child.down_child.option_value)/(self.tree.up_child.up_child.present_value - self.tree.up_child.down_child.present_value)
+            gamma_param2 = (self.tree.up_child.down_child.option_value - self.tree.down_child.down_child.option_value)/(self.tree.up_child.down_child.present_value - self.tree.down_child.down_child.present_value)
+            middle_value = self.tree.up_child.down_child.option_value
+            middle_offset = self.tree.up_child.down_child.present_value - self.tree.present_value
+            spot_spread = self.tree.up_child.up_child.present_value - self.tree.down_child.down_child.present_value
+        self.gamma = (gamma_param1 - gamma_param2)/(0.5 * spot_spread)
+        self.theta = middle_node_theta(self.tree.option_value, middle_value, middle_offset, self.delta, self.gamma, self.tenure/self.num_period)
+
+        self.vega = None
+        self.rho = None
+        if (bumped_greeks):
+            # Vega and rho come from the bump-and-reprice engine, which builds up/down from the volatility.
+            bumped = lattice_greeks(self.specification, self.option, self.present_spot, self.strike_price, self.risk_free_rate, self.continuous_income_rate, self.volatility, self.tenure, self.num_period, payment_values=payment_values_from_node(self.paymentNodes, self.num_period), smooth=False)
+            # Its base scenario must reproduce the priced lattice for every specification.
+            if (not math.isclose(float(bumped["price"][0]), self.price, rel_tol=1e-9, abs_tol=1e-12)):
+                raise ValueError("bumped Greeks were computed on a different lattice than the priced one")
+            self.vega = float(bumped["vega"][0])
+            self.rho = float(bumped["rho"][0])
+        if (self.instrumentation != None):
+            self.instrumentation.stop("greeks", started, scenarios=BUMP_SCENARIOS if bumped_greeks else 0)
+        return Lattice_Result(self.price, delta=self.delta, gamma=self.gamma, theta=self.theta, vega=self.vega, rho=self.rho)
+
+def main():
+
+    # Traditional approach
+    specification = UpDownSpecification.ALTERNATIVE
+    option = OptionType.EUROPEAN_PUT
+    tenure = 1
+    numperiod = 4
+    time_delta = tenure/numperiod
+    volatility = 0.15
+    risk_free_rate = 0.005
+    spot_price = 1.65
+    strike_price = 1.65
+    continuous_income_rate = 0.02
+    up = math.exp(volatility * math.sqrt(time_delta))
+    down = math.exp(-1*volatility * math.sqrt(time_delta))
+
+    payments = [Payment(1, 0.03*spot_price, risk_free_rate)]
+    paymentNode = None # Discrete_Payment_Node(0, time_delta, numperiod, risk_free_rate, payments)
+    tree = Binomial_Lattice_Tree_Interval(specification, option, spot_price, strike_price, risk_free_rate, up, down, tenure, numperiod, continuous_income_rate, volatility, paymentNode, node_export='./lattice-output.csv', bumped_greeks=True)
+    print(tree.result)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
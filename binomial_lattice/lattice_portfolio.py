@@ -0,0 +1,68 @@
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .lattice_batch import contract_arrays, price_contracts
+
+DEFAULT_PORTFOLIO_CHUNK_SIZE = 2048
+
+# Row layout of the shared input buffer; enums travel as their integer values. When the
+# contracts carry payments, a (contracts, num_period + 1) block of payment PVs follows.
+INPUT_ROWS = ("specification", "option", "present_spot", "strike_price", "risk_free_rate", "continuous_income_rate", "volatility", "tenure")
+
+
+def _shared_inputs(buffer, size, num_period, has_payments):
+    inputs = np.ndarray((len(INPUT_ROWS), size), dtype=np.float64, buffer=buffer)
+    payments = np.ndarray((size, num_period + 1), dtype=np.float64, buffer=buffer, offset=inputs.nbytes) if has_payments else None
+    return inputs, payments
+
+
+def _price_chunk(input_name, output_name, size, start, stop, num_period, has_payments=False):
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs, payments = _shared_inputs(input_memory.buf, size, num_period, has_payments)
+        outputs = np.ndarray((size,), dtype=np.float64, buffer=output_memory.buf)
+        chunk = inputs[:, start:stop]
+        outputs[start:stop] = price_contracts(chunk[0].astype(int), chunk[1].astype(int), *chunk[2:], num_period, chunk_size=stop - start, payment_values=None if payments is None else payments[start:stop])
+    finally:
+        inputs = payments = outputs = chunk = None
+        input_memory.close()
+        output_memory.close()
+    return start, stop
+
+
+def value_portfolio(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, chunk_size=DEFAULT_PORTFOLIO_CHUNK_SIZE, max_workers=None, use_processes=True, payment_values=None):
+    specifications, options, numeric = contract_arrays(specification, option, present_spot, strike_price, risk_free_rate, continuous_income_rate, volatility, tenure)
+    size = numeric[0].shape[0]
+    has_payments = payment_values is not None
+    if (has_payments):
+        payment_values = np.broadcast_to(np.asarray(payment_values, dtype=float), (size, num_period + 1))
+
+    workers = max_workers if max_workers else (os.cpu_count() or 1)
+    if (not use_processes or workers == 1 or size <= chunk_size):
+        return price_contracts(specifications, options, *numeric, num_period, chunk_size=chunk_size, payment_values=payment_values)
+
+    input_memory = shared_memory.SharedMemory(create=True, size=(len(INPUT_ROWS) + (num_period + 1 if has_payments else 0))*size*8)
+    output_memory = shared_memory.SharedMemory(create=True, size=size*8)
+    try:
+        inputs, payments = _shared_inputs(input_memory.buf, size, num_period, has_payments)
+        outputs = np.ndarray((size,), dtype=np.float64, buffer=output_memory.buf)
+        if (has_payments):
+            payments[:] = payment_values
+        inputs[0] = [specification.value for specification in specifications]
+        inputs[1] = [option.value for option in options]
+        inputs[2:] = numeric
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_price_chunk, input_memory.name, output_memory.name, size, start, min(start + chunk_size, size), num_period, has_payments) for start in range(0, size, chunk_size)]
+            for future in futures:
+                future.result()
+        prices = outputs.copy()
+    finally:
+        inputs = payments = outputs = None
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+    return prices
@@ -0,0 +1,127 @@
+import numpy as np
+from .lattice_engine import UpDownSpecification, OptionType, exercise_boundary_spot
+
+
+# Flat-forward curve: values[k] applies on [times[k], times[k + 1]) and the last value
+# extends beyond the final knot. Integrals over any interval are exact.
+class Term_Structure_Curve:
+    def __init__(self, times, values):
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        if (self.times.ndim != 1 or self.times.shape != self.values.shape or self.times[0] != 0 or np.any(np.diff(self.times) <= 0)):
+            raise ValueError("curve times must start at 0, increase strictly and match the values")
+        self.knot_integrals = np.concatenate([[0.0], np.cumsum(self.values[:-1]*np.diff(self.times))])
+
+    @classmethod
+    def from_steps(cls, values, tenure):
+        values = np.asarray(values, dtype=float)
+        return cls(tenure*np.arange(values.shape[0])/values.shape[0], values)
+
+    def value(self, time):
+        return self.values[np.searchsorted(self.times, time, side="right") - 1]
+
+    def integral(self, time):
+        time = np.asarray(time, dtype=float)
+        segment = np.searchsorted(self.times, time, side="right") - 1
+        return self.knot_integrals[segment] + self.values[segment]*(time - self.times[segment])
+
+    def average(self, start_time, end_time):
+        return (self.integral(end_time) - self.integral(start_time))/(np.asarray(end_time) - np.asarray(start_time))
+
+
+def as_curve(value, tenure):
+    # Scalars become flat curves and arrays are read as one value per equal time step.
+    if (isinstance(value, Term_Structure_Curve)):
+        return value
+    if (np.isscalar(value)):
+        return Term_Structure_Curve([0.0], [value])
+    return Term_Structure_Curve.from_steps(value, tenure)
+
+
+def curve_payment_present_values(payments, rate_curve, times):
+    # PV at each time of the payments still to come, discounted along the rate curve.
+    times = np.asarray(times, dtype=float)
+    if (len(payments) == 0):
+        return np.zeros(times.shape[0])
+    payment_times = np.array([payment.time for payment in payments], dtype=float)
+    amounts = np.array([payment.amount for payment in payments], dtype=float)
+    order = np.argsort(payment_times, kind="stable")
+    payment_times = payment_times[order]
+    discounted = amounts[order]*np.exp(-1*(rate_curve.integral(payment_times) - rate_curve.integral(payment_times[0])))
+    remaining = np.append(np.cumsum(discounted[::-1])[::-1], 0.0)
+    first_remaining = np.searchsorted(payment_times, times, side="right")
+    return remaining[first_remaining]*np.exp(rate_curve.integral(times) - rate_curve.integral(payment_times[0]))
+
+
+# Recombining lattice under time-dependent rate, income rate and volatility. Step
+# boundaries are placed so every step carries the same variance, which keeps the log
+# spacing of the nodes constant and the lattice recombining; rates and income rates
+# then enter through the per-step probabilities (TRADITIONAL) or the per-step drift of
+# the nodes (ALTERNATIVE). All per-level quantities are precomputed as vectors.
+class Term_Structure_Lattice:
+    def __init__(self, specification, present_spot, risk_free_rate, continuous_income_rate, volatility, tenure, num_period, payments=None):
+        self.specification = specification
+        self.tenure = tenure
+        self.num_period = num_period
+        self.rate_curve = as_curve(risk_free_rate, tenure)
+        self.income_curve = as_curve(continuous_income_rate, tenure)
+        volatility_curve = as_curve(volatility, tenure)
+        if (np.any(volatility_curve.values <= 0)):
+            raise ValueError("term-structure lattices need a strictly positive volatility")
+        variance_curve = Term_Structure_Curve(volatility_curve.times, volatility_curve.values**2)
+
+        knots = np.append(variance_curve.times[variance_curve.times < tenure], tenure)
+        step_variance = float(variance_curve.integral(tenure))/num_period
+        self.times = np.interp(step_variance*np.arange(num_period + 1), variance_curve.integral(knots), knots)
+        self.times[-1] = tenure
+        self.time_deltas = np.diff(self.times)
+
+        rate_integrals = np.diff(self.rate_curve.integral(self.times))
+        income_integrals = np.diff(self.income_curve.integral(self.times))
+        jump = np.sqrt(step_variance)
+        self.up = np.exp(jump)
+        self.down = np.exp(-1*jump)
+        if (specification == UpDownSpecification.TRADITIONAL):
+            probability = (np.exp(rate_integrals - income_integrals) - self.down)/(self.up - self.down)
+            self.drift = np.zeros(num_period + 1)
+        elif (specification == UpDownSpecification.ALTERNATIVE):
+            probability = np.full(num_period, 0.5)
+            self.drift = np.concatenate([[0.0], np.cumsum(rate_integrals - income_integrals - step_variance/2)])
+        else:
+            raise ValueError("term-structure lattices support the TRADITIONAL and ALTERNATIVE specifications")
+        if (np.any(probability < 0) or np.any(probability > 1)):
+            raise ValueError("rates are too far from the volatility for this step count; increase num_period")
+
+        discount = np.exp(-1*rate_integrals)
+        self.risk_neutral_probabilities = probability
+        self.up_weights = discount*probability
+        self.down_weights = discount*(1 - probability)
+        self.payment_values = curve_payment_present_values(payments if payments else [], self.rate_curve, self.times)
+        self.present_value = present_spot - self.payment_values[0]
+
+    def spot_level(self, level):
+        moves = np.arange(level + 1)
+        return self.present_value*np.exp(self.drift[level])*self.up**(level - moves)*self.down**moves + self.payment_values[level]
+
+    def backward_induction(self, strike_price, is_call, is_american):
+        sign = 1.0 if is_call else -1.0
+        spot = self.spot_level(self.num_period)
+        values = np.maximum(sign*(spot - strike_price), 0)
+        self.exercise_boundary = None
+        if (is_american):
+            self.exercise_boundary = np.full(self.num_period + 1, np.nan)
+            self.exercise_boundary[self.num_period] = exercise_boundary_spot(spot, values, 0, is_call)
+        for level in range(self.num_period - 1, -1, -1):
+            values = self.up_weights[level]*values[:level + 1] + self.down_weights[level]*values[1:level + 2]
+            if (is_american):
+                spot = self.spot_level(level)
+                exercise = sign*(spot - strike_price)
+                self.exercise_boundary[level] = exercise_boundary_spot(spot, exercise, values, is_call)
+                np.maximum(values, exercise, out=values)
+        self.option_value = float(values[0])
+        return self.option_value
+
+    def price(self, option, strike_price):
+        is_call = option in (OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL)
+        is_american = option in (OptionType.AMERICAN_CALL, OptionType.AMERICAN_PUT)
+        return self.backward_induction(strike_price, is_call, is_american)
@@ -0,0 +1,215 @@
+import numpy as np
+import math
+from datetime import datetime, timedelta
+from enum import Enum
+from .lattice_engine import UpDownSpecification, OptionType, Lattice_Backend, Lattice_Result, Recombining_Lattice, Spot_Shift_Lattice, DEFAULT_SPOT_SHIFTS, leisen_reimer_parameters
+from .black_scholes_engine import bsm_value
+from .lattice_term_structure import Term_Structure_Lattice
+from .lattice_instrumentation import lattice_node_count
+
+class Lattice_Node:
+    def __init__(self, present_value, up, down, levels_outstanding, parent):
+        self.parent = parent
+        self.present_value = present_value
+        if (levels_outstanding > 0):
+            self.up_child = Lattice_Node(present_value*up, up, down, levels_outstanding - 1, self)
+            self.down_child = Lattice_Node(present_value*down, up, down, levels_outstanding - 1, self)
+        else:
+            self.up_child = None
+            self.down_child = None
+    def calculate_european_call_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            return max(self.present_value - strike_price, 0)
+        else:
+            return (((risk_neutral_probability)*(self.up_child.calculate_european_call_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_european_call_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t))
+    
+    def calculate_american_call_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            return max(self.present_value - strike_price, 0)
+        else:
+            return max((((risk_neutral_probability)*(self.up_child.calculate_american_call_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_american_call_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t)), self.present_value - strike_price, 0)
+
+    def calculate_european_put_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            return max(strike_price - self.present_value, 0)
+        else:
+            return (((risk_neutral_probability)*(self.up_child.calculate_european_put_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_european_put_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t))
+
+    def calculate_american_put_price(self, strike_price, risk_neutral_probability, rate, delta_t):
+        if (self.up_child == None and self.down_child == None):
+            return max(strike_price - self.present_value, 0)
+        else:
+            return max((((risk_neutral_probability)*(self.up_child.calculate_american_put_price(strike_price, risk_neutral_probability, rate, delta_t)) + (1 - risk_neutral_probability)*(self.down_child.calculate_american_put_price(strike_price, risk_neutral_probability, rate, delta_t)))*math.exp(-1*rate*delta_t)), strike_price - self.present_value, 0)
+ 
+
+class Binomial_Lattice_Tree:
+    def __init__(self, specification, option, present_spot, strike_price, risk_free_rate, up, down, start_date, end_date, num_period, continuous_income_rate, volatility, backend=Lattice_Backend.RECOMBINING, cache=None, instrumentation=None, spot_shifts=None):
+        self.specification = specification
+        self.option = option
+        self.present_spot = present_spot
+        self.strike_price = strike_price
+        self.risk_free_rate = risk_free_rate
+        self.up = up
+        self.down = down
+        self.start_date = start_date
+        self.end_date = end_date
+        self.num_period = num_period
+        self.continuous_income_rate = continuous_income_rate if continuous_income_rate is not None else 0
+        self.volatility = volatility
+        self.backend = backend
+        self.exercise_boundary = None
+        self.spot_shift_lattice = None
+        self.tree = None
+
+        time_delta = ((self.end_date - self.start_date).days/365)/self.num_period
+        self.time_delta = time_delta
+
+        # Arrays or curves for the rate, income rate or volatility switch to the
+        # term-structure lattice, which derives its own up/down spacing from the volatility.
+        if (not all(np.isscalar(value) for value in (self.risk_free_rate, self.continuous_income_rate, self.volatility))):
+            if (spot_shifts != None):
+                raise ValueError("spot repricing needs the recombining backend with flat rates")
+            if (instrumentation != None):
+                started = instrumentation.start()
+            self.tree = Term_Structure_Lattice(self.specification, self.present_spot, self.risk_free_rate, self.continuous_income_rate, self.volatility, time_delta*self.num_period, self.num_period)
+            if (instrumentation != None):
+                node_count = lattice_node_count(self.num_period)
+                instrumentation.stop("lattice_construction", started, nodes=node_count, term_structure=1)
+                started = instrumentation.start()
+            self.price = self.tree.price(option, self.strike_price)
+            self.result = Lattice_Result(self.price)
+            self.exercise_boundary = self.tree.exercise_boundary
+            if (instrumentation != None):
+                instrumentation.stop("backward_induction", started, nodes=node_count, term_structure=1)
+            return
+
+        if (self.specification == UpDownSpecification.TRADITIONAL):
+            self.risk_neutral_probability = ((math.exp((self.risk_free_rate - self.continuous_income_rate)*time_delta) - self.down)/(self.up - self.down))
+        if (self.specification == UpDownSpecification.ALTERNATIVE):
+            self.risk_neutral_probability = 0.5
+            self.up = math.exp((self.risk_free_rate - self.continuous_income_rate - (self.volatility**2)/2)*time_delta + self.volatility*math.sqrt(time_delta))
+            self.down = math.exp((self.risk_free_rate - self.continuous_income_rate - (self.volatility**2)/2)*time_delta - self.volatility*math.sqrt(time_delta))
+        if (self.specification == UpDownSpecification.LEISEN_REIMER):
+            up, down, probability = leisen_reimer_parameters(self.present_spot, self.strike_price, self.risk_free_rate, self.continuous_income_rate, self.volatility, time_delta*self.num_period, self.num_period)
+            self.up = float(up)
+            self.down = float(down)
+            self.risk_neutral_probability = float(probability)
+        last_step = None
+        if (self.specification == UpDownSpecification.BINOMIAL_BLACK_SCHOLES):
+            self.risk_neutral_probability = ((math.exp((self.risk_free_rate - self.continuous_income_rate)*time_delta) - self.down)/(self.up - self.down))
+            sign = 1.0 if option in (OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL) else -1.0
+            last_step = lambda spot: bsm_value(sign, spot, self.strike_price, self.risk_free_rate, self.continuous_income_rate, self.volatility, time_delta)
+        self.last_step = last_step
+
+        # With spot_shifts the contract is priced on the centre root of a Spot_Shift_Lattice
+        # with that many shifts either side, so reprice_spot reuses the priced lattice.
+        if (spot_shifts != None):
+            if (instrumentation != None):
+                started = instrumentation.start()
+            self.spot_shift_lattice = self.build_spot_shift_lattice(self.present_spot, spot_shifts)
+            self.price = self.spot_shift_lattice.price
+            self.result = Lattice_Result(self.price)
+            self.exercise_boundary = self.spot_shift_lattice.exercise_boundary
+            if (instrumentation != None):
+                instrumentation.stop("backward_induction", started, nodes=self.spot_shift_lattice.node_count, spot_shifts=spot_shifts)
+            return
+
+        if (instrumentation != None):
+            started = instrumentation.start()
+            cache_stats = None if cache == None else cache.stats()
+        if (self.backend == Lattice_Backend.RECOMBINING):
+            skeleton = None if cache == None else cache.skeleton(self.present_spot, self.up, self.down, self.num_period, self.risk_free_rate, time_delta, self.risk_neutral_probability)
+            self.tree = Recombining_Lattice(self.present_spot, self.up, self.down, self.num_period, skeleton=skeleton, last_step=last_step)
+        elif (last_step != None):
+            raise ValueError("the binomial Black-Scholes specification needs the recombining backend")
+        else:
+            self.tree = Lattice_Node(self.present_spot, self.up, self.down, self.num_period, None)
+        if (instrumentation != None):
+            node_count = lattice_node_count(self.num_period, self.backend == Lattice_Backend.RECOMBINING)
+            cache_fields = {} if cache == None else {"cache_hits": cache.hits - cache_stats["hits"], "cache_misses": cache.misses - cache_stats["misses"]}
+            instrumentation.stop("lattice_construction", started, nodes=node_count, **cache_fields)
+            started = instrumentation.start()
+
+        if (option == OptionType.EUROPEAN_CALL):
+            self.price = self.tree.calculate_european_call_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.EUROPEAN_PUT):
+            self.price = self.tree.calculate_european_put_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.AMERICAN_CALL):
+            self.price = self.tree.calculate_american_call_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        if (option == OptionType.AMERICAN_PUT):
+            self.price = self.tree.calculate_american_put_price(self.strike_price, self.risk_neutral_probability, self.risk_free_rate, time_delta)
+        self.result = Lattice_Result(self.price)
+        if (instrumentation != None):
+            held = {"bytes": self.tree.retained_bytes()} if self.backend == Lattice_Backend.RECOMBINING else {}
+            instrumentation.stop("backward_induction", started, nodes=node_count, **held)
+        if (self.backend == Lattice_Backend.RECOMBINING):
+            self.exercise_boundary = self.tree.exercise_boundary
+
+    def build_spot_shift_lattice(self, present_spot, max_shift):
+        # Leisen-Reimer up/down/p depend on the spot itself, so those lattices cannot be shifted.
+        if (self.backend != Lattice_Backend.RECOMBINING):
+            raise ValueError("spot repricing needs the recombining backend with flat rates")
+        if (self.specification == UpDownSpecification.LEISEN_REIMER):
+            raise ValueError("Leisen-Reimer parameters depend on the spot; price a new tree instead")
+        is_call = self.option in (OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL)
+        is_american = self.option in (OptionType.AMERICAN_CALL, OptionType.AMERICAN_PUT)
+        return Spot_Shift_Lattice(present_spot, self.up, self.down, self.num_period, self.strike_price, self.risk_neutral_probability, self.risk_free_rate, self.time_delta, is_call, is_american, last_step=self.last_step, max_shift=max_shift)
+
+    def reprice_spot(self, present_spot, max_shift=DEFAULT_SPOT_SHIFTS):
+        # Spot-only revaluation: the up/down/p of the first pricing are kept and the price is
+        # read off the cached Spot_Shift_Lattice (built by the first pricing when spot_shifts
+        # was given), which is rebuilt around the new spot only when it leaves the cached
+        # range. See Spot_Shift_Lattice for the interpolation error.
+        if (self.spot_shift_lattice == None and isinstance(self.tree, Term_Structure_Lattice)):
+            raise ValueError("spot repricing needs the recombining backend with flat rates")
+        if (self.spot_shift_lattice == None or not self.spot_shift_lattice.covers(present_spot)):
+            self.spot_shift_lattice = self.build_spot_shift_lattice(present_spot, max_shift)
+            self.exercise_boundary = self.spot_shift_lattice.exercise_boundary
+        return self.spot_shift_lattice.reprice(present_spot)
+    
+    def create_tree(self):
+        time_delta = ((self.end_date - self.start_date).days/365)/self.num_period
+        risk_neutral_probability = ((math.exp(self.risk_free_rate*time_delta) - self.down)/(self.up - self.down))
+
+        self.tree = Lattice_Node(self.present_spot, self.up, self.down, self.num_period, None)
+        return self.tree.calculate_american_put_price(self.strike_price, risk_neutral_probability, self.risk_free_rate, time_delta)
+
+    def create_tree_continuous_rate(self, income_rate):
+        time_delta = ((self.end_date - self.start_date).days/365)/self.num_period
+        risk_neutral_probability = ((math.exp((self.risk_free_rate - income_rate)*time_delta) - self.down)/(self.up - self.down))
+
+        self.tree = Lattice_Node(self.present_spot, self.up, self.down, self.num_period, None)
+        return self.tree.calculate_european_call_price(self.strike_price, risk_neutral_probability, self.risk_free_rate, time_delta)
+
+    def create_tree_alternative_continuous_rate(self, income_rate):
+        time_delta = ((self.end_date - self.start_date).days/365)/self.num_period
+        risk_neutral_probability = 0.5
+
+
+def main():
+
+    # Traditional approach
+    specification = UpDownSpecification.ALTERNATIVE
+    option = OptionType.AMERICAN_CALL
+    enddate = datetime(2020, 10, 1)
+    startdate = datetime(2020, 1, 1)
+    numperiod = 3
+    time_delta = ((enddate - startdate).days/365)/numperiod
+    volatility = 0.05
+    risk_free_rate = 0.05
+    spot_price = 115
+    strike_price = 115
+    continuous_income_rate = 0.06
+    up = math.exp(volatility * math.sqrt(time_delta))
+    down = math.exp(-1*volatility * math.sqrt(time_delta))
+
+
+    tree = Binomial_Lattice_Tree(specification, option, spot_price, strike_price, risk_free_rate, up, down, startdate, enddate, numperiod, continuous_income_rate, volatility)
+    print(tree.result)
+
+
+
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.black_scholes_engine import normal_cdf, bsm_price, bsm_greeks, control_variate_price, bsm_implied_volatility
+from binomial_lattice.black_scholes_merton import Black_Scholes_Merton_Equation
+
+CONTRACT = (np.array([80.0, 100.0, 125.0]), 100, 0.05, 0.02, 0.3, 1.0)
+BUMP = 1e-4
+
+
+def test_normal_cdf_matches_erf():
+    x = np.linspace(-40, 40, 4001)
+    expected = [0.5*math.erfc(-value/math.sqrt(2)) for value in x]
+    np.testing.assert_allclose(normal_cdf(x), expected, rtol=1e-14, atol=1e-16)
+
+
+def test_put_call_parity():
+    spot, strike, rate, income_rate, volatility, tenure = CONTRACT
+    call = bsm_price(OptionType.EUROPEAN_CALL, *CONTRACT)
+    put = bsm_price(OptionType.EUROPEAN_PUT, *CONTRACT)
+    np.testing.assert_allclose(call - put, spot*math.exp(-income_rate*tenure) - strike*math.exp(-rate*tenure), atol=1e-12)
+
+
+@pytest.mark.parametrize("option", [OptionType.EUROPEAN_CALL, OptionType.EUROPEAN_PUT])
+def test_greeks_match_finite_differences(option):
+    spot, strike, rate, income_rate, volatility, tenure = CONTRACT
+    greeks = bsm_greeks(option, *CONTRACT)
+    price = lambda **bumped: bsm_price(option, *[bumped.get(name, value) for name, value in zip(("spot", "strike", "rate", "income_rate", "volatility", "tenure"), CONTRACT)])
+    h = spot*BUMP
+    np.testing.assert_allclose(greeks["delta"], (price(spot=spot + h) - price(spot=spot - h))/(2*h), atol=1e-7)
+    np.testing.assert_allclose(greeks["gamma"], (price(spot=spot + h) - 2*price() + price(spot=spot - h))/h**2, atol=1e-5)
+    np.testing.assert_allclose(greeks["vega"], (price(volatility=volatility + BUMP) - price(volatility=volatility - BUMP))/(2*BUMP), atol=1e-6)
+    np.testing.assert_allclose(greeks["rho"], (price(rate=rate + BUMP) - price(rate=rate - BUMP))/(2*BUMP), atol=1e-6)
+    np.testing.assert_allclose(greeks["theta"], -1*(price(tenure=tenure + BUMP) - price(tenure=tenure - BUMP))/(2*BUMP), atol=1e-6)
+
+
+def test_control_variate_is_closer_to_fine_lattice():
+    reference = price_contracts(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, *CONTRACT, 5000)
+    plain = price_contracts(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, *CONTRACT, 100)
+    corrected = control_variate_price(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, *CONTRACT, 100)
+    assert np.all(np.abs(corrected - reference) < np.abs(plain - reference))
+
+
+def test_european_control_variate_is_the_closed_form():
+    np.testing.assert_allclose(control_variate_price(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, *CONTRACT, 100), bsm_price(OptionType.EUROPEAN_CALL, *CONTRACT), atol=1e-12)
+
+
+def test_closed_form_implied_volatility_round_trip():
+    volatility = np.array([0.1, 0.3, 0.8])
+    spot, strike, rate, income_rate, _, tenure = CONTRACT
+    prices = bsm_price(OptionType.EUROPEAN_PUT, spot, strike, rate, income_rate, volatility, tenure)
+    np.testing.assert_allclose(bsm_implied_volatility(OptionType.EUROPEAN_PUT, prices, spot, strike, rate, income_rate, tenure), volatility, atol=1e-8)
+
+
+def test_american_equation_reports_no_european_greeks():
+    equation = Black_Scholes_Merton_Equation(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 100, 0.05, None, None, datetime(2024, 1, 1), datetime(2024, 12, 31), 200, 0.02, 0.3)
+    european = Black_Scholes_Merton_Equation(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_PUT, 100, 100, 0.05, None, None, datetime(2024, 1, 1), datetime(2024, 12, 31), 200, 0.02, 0.3)
+    assert equation.delta is None and equation.vega is None
+    assert equation.price > european.price
@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import payment_present_values, payment_values_from_node
+from binomial_lattice.lattice_interval import Payment, Discrete_Payment_Node
+
+RATE = 0.05
+TENURE = 1.0
+# Payment dates sit between lattice dates: the old recursion accumulated node times by
+# repeated addition, so its result on a payment date depends on rounding.
+PAYMENTS = [Payment(0.61, 2.0, 0.04), Payment(0.26, 1.5, 0.06), Payment(0.93, 1.0, RATE), Payment(0.93, 0.5, RATE)]
+
+
+# The payment node as it stood before the recombining engine: one recursive sum per node.
+class Reference_Payment_Node:
+    def __init__(self, time, time_delta, periods_left, rate, payments):
+        value = 0
+        for payment in payments:
+            if (payment.time > time):
+                value = value + math.exp(-1*(payment.rate if rate == None else rate)*(payment.time - time))*payment.amount
+        self.up_child = Reference_Payment_Node(time + time_delta, time_delta, periods_left - 1, rate, payments) if periods_left > 0 else None
+        self.value = value
+
+
+def reference_payment_values(time_delta, num_period, rate, payments, start_time=0):
+    values = []
+    node = Reference_Payment_Node(start_time, time_delta, num_period, rate, payments)
+    while (node != None):
+        values.append(node.value)
+        node = node.up_child
+    return np.array(values)
+
+
+@pytest.mark.parametrize("rate", [RATE, None])
+@pytest.mark.parametrize("num_period", [1, 4, 8, 40])
+def test_payment_present_values_match_reference(num_period, rate):
+    time_delta = TENURE/num_period
+    expected = reference_payment_values(time_delta, num_period, rate, PAYMENTS)
+    np.testing.assert_allclose(payment_present_values(PAYMENTS, rate, time_delta, num_period), expected, rtol=1e-13, atol=1e-13)
+    np.testing.assert_allclose(payment_present_values(PAYMENTS, rate, time_delta, num_period, start_time=0.1), reference_payment_values(time_delta, num_period, rate, PAYMENTS, 0.1), rtol=1e-13, atol=1e-13)
+
+
+def test_payment_node_chain_matches_reference():
+    num_period = 8
+    node = Discrete_Payment_Node(0, TENURE/num_period, num_period, RATE, PAYMENTS)
+    np.testing.assert_allclose(payment_values_from_node(node, num_period), reference_payment_values(TENURE/num_period, num_period, RATE, PAYMENTS), rtol=1e-13, atol=1e-13)
+    # Up and down children share one node per level, so the walk is O(N) nodes.
+    assert node.up_child is node.down_child
+    assert node.up_child.time == pytest.approx(TENURE/num_period)
+
+
+def test_payment_on_a_lattice_date_is_no_longer_outstanding():
+    values = payment_present_values([Payment(0.25, 1.5, RATE)], RATE, 0.025, 40)
+    assert values[9] == pytest.approx(1.5*math.exp(-1*RATE*0.025))
+    assert values[10] == 0.0
+
+
+def test_no_payments_give_zero_values():
+    assert payment_present_values([], RATE, 0.1, 5).tolist() == [0.0]*6
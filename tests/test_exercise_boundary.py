@@ -0,0 +1,85 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.black_scholes_engine import bsm_price
+
+NUM_PERIOD = 200
+
+
+def lattice(option, present_spot=100, num_period=NUM_PERIOD, income_rate=0.02, specification=UpDownSpecification.TRADITIONAL, **kwargs):
+    up = math.exp(0.3*math.sqrt(1/num_period))
+    return Binomial_Lattice_Tree(specification, option, present_spot, 100, 0.05, up, 1/up, datetime(2024, 1, 1), datetime(2024, 12, 31), num_period, income_rate, 0.3, **kwargs)
+
+
+def test_american_put_boundary_lies_below_the_strike():
+    boundary = lattice(OptionType.AMERICAN_PUT).exercise_boundary
+    assert boundary.shape == (NUM_PERIOD + 1,)
+    assert np.nanmax(boundary) < 100
+    # Far from expiry the put is only exercised deep in the money.
+    assert boundary[NUM_PERIOD//4] < boundary[NUM_PERIOD - 1]
+
+
+def test_call_without_income_is_only_exercised_at_expiry():
+    boundary = lattice(OptionType.AMERICAN_CALL, income_rate=0.0).exercise_boundary
+    assert np.isnan(boundary[:-1]).all()
+    assert boundary[-1] == pytest.approx(100)
+    assert lattice(OptionType.EUROPEAN_PUT).exercise_boundary is None
+
+
+def test_spot_shift_boundary_refines_the_lattice_boundary():
+    plain = lattice(OptionType.AMERICAN_PUT)
+    shifted = lattice(OptionType.AMERICAN_PUT, spot_shifts=10)
+    # The shifted lattice holds every node of the plain one plus one node between each pair.
+    priced = ~np.isnan(plain.exercise_boundary)
+    half_step = math.sqrt(plain.up/plain.down)
+    assert np.all(shifted.exercise_boundary[priced] >= plain.exercise_boundary[priced] - 1e-9)
+    assert np.all(shifted.exercise_boundary[priced] <= plain.exercise_boundary[priced]*half_step + 1e-9)
+
+
+@pytest.mark.parametrize("option", [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_PUT])
+def test_first_tick_reuses_the_priced_lattice(option):
+    priced = lattice(option, spot_shifts=10)
+    assert priced.price == pytest.approx(lattice(option).price, abs=1e-10)
+    spot_shift_lattice = priced.spot_shift_lattice
+    priced.reprice_spot(100.5)
+    assert priced.spot_shift_lattice is spot_shift_lattice
+
+
+@pytest.mark.parametrize("option", [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_PUT])
+def test_repricing_is_exact_on_root_spots(option):
+    priced = lattice(option, spot_shifts=10)
+    for spot in priced.spot_shift_lattice.root_spots[7:14]:
+        assert priced.reprice_spot(spot) == pytest.approx(lattice(option, spot).price, abs=1e-10)
+
+
+def test_interpolation_error_is_bounded_by_the_lattice_error():
+    num_period = 501
+    priced = lattice(OptionType.EUROPEAN_CALL, num_period=num_period, spot_shifts=10)
+    spots = np.linspace(99, 101, 41)
+    repriced = np.array([priced.reprice_spot(spot) for spot in spots])
+    fresh = np.array([lattice(OptionType.EUROPEAN_CALL, spot, num_period).price for spot in spots])
+    exact = bsm_price(OptionType.EUROPEAN_CALL, spots, 100, 0.05, 0.02, 0.3, 1.0)
+    # Between roots the interpolant is no worse than a fresh lattice against the closed form,
+    # so the two differ by at most twice the lattice error (5.6e-3 here, documented 5.7e-3).
+    lattice_error = np.max(np.abs(fresh - exact))
+    assert np.max(np.abs(repriced - exact)) <= lattice_error + 1e-12
+    assert np.max(np.abs(repriced - fresh)) <= min(2*lattice_error, 5.8e-3)
+
+
+def test_spot_outside_the_range_rebuilds_the_lattice():
+    priced = lattice(OptionType.AMERICAN_PUT, spot_shifts=5)
+    spot_shift_lattice = priced.spot_shift_lattice
+    assert priced.reprice_spot(130) == pytest.approx(lattice(OptionType.AMERICAN_PUT, 130).price, abs=1e-10)
+    assert priced.spot_shift_lattice is not spot_shift_lattice
+
+
+def test_leisen_reimer_and_term_structures_cannot_be_shifted():
+    with pytest.raises(ValueError):
+        lattice(OptionType.AMERICAN_PUT, specification=UpDownSpecification.LEISEN_REIMER, num_period=201).reprice_spot(101)
+    with pytest.raises(ValueError):
+        lattice(OptionType.AMERICAN_PUT, income_rate=np.full(NUM_PERIOD, 0.02)).reprice_spot(101)
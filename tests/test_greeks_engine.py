@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, payment_present_values
+from binomial_lattice.lattice_interval import Payment, Binomial_Lattice_Tree_Interval
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.greeks_engine import lattice_greeks
+from binomial_lattice.black_scholes_engine import bsm_greeks
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+SPOTS = np.full(len(OPTIONS), 100.0)
+RATE = 0.05
+INCOME_RATE = 0.02
+VOLATILITY = 0.3
+TENURE = 1.0
+NUM_PERIOD = 60
+PAYMENT_VALUES = payment_present_values([Payment(0.3, 2.0, RATE), Payment(0.8, 1.5, RATE)], RATE, TENURE/NUM_PERIOD, NUM_PERIOD)
+
+
+@pytest.mark.parametrize("payment_values", [None, PAYMENT_VALUES])
+@pytest.mark.parametrize("specification", list(UpDownSpecification))
+def test_greeks_price_matches_batch_price(specification, payment_values):
+    greeks = lattice_greeks(specification, OPTIONS, SPOTS, 105, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, payment_values=payment_values)
+    expected = price_contracts(specification, OPTIONS, SPOTS, 105, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, payment_values=payment_values)
+    np.testing.assert_allclose(greeks["price"], expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("specification", list(UpDownSpecification))
+def test_vega_and_rho_match_repricing(specification):
+    greeks = lattice_greeks(specification, OPTIONS, SPOTS, 105, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, payment_values=PAYMENT_VALUES)
+    price = lambda volatility, rate: price_contracts(specification, OPTIONS, SPOTS, 105, rate, INCOME_RATE, volatility, TENURE, NUM_PERIOD, payment_values=PAYMENT_VALUES)
+    np.testing.assert_allclose(greeks["vega"], (price(VOLATILITY + 0.01, RATE) - price(VOLATILITY - 0.01, RATE))/0.02, rtol=1e-12)
+    np.testing.assert_allclose(greeks["rho"], (price(VOLATILITY, RATE + 1e-4) - price(VOLATILITY, RATE - 1e-4))/2e-4, rtol=1e-9)
+
+
+@pytest.mark.parametrize("specification", [UpDownSpecification.TRADITIONAL, UpDownSpecification.LEISEN_REIMER])
+def test_european_greeks_approach_closed_form(specification):
+    options = [OptionType.EUROPEAN_CALL, OptionType.EUROPEAN_PUT]
+    greeks = lattice_greeks(specification, options, [100.0, 100.0], 105, RATE, INCOME_RATE, VOLATILITY, TENURE, 501)
+    expected = bsm_greeks(options, [100.0, 100.0], 105, RATE, INCOME_RATE, VOLATILITY, TENURE)
+    for name, tolerance in (("delta", 1e-3), ("gamma", 1e-4), ("theta", 1e-2), ("vega", 0.2), ("rho", 0.2)):
+        np.testing.assert_allclose(greeks[name], expected[name], atol=tolerance)
+
+
+@pytest.mark.parametrize("specification", list(UpDownSpecification))
+def test_interval_bumped_greeks_reprice_the_priced_lattice(specification):
+    up = math.exp(VOLATILITY*math.sqrt(TENURE/NUM_PERIOD))
+    for option in OPTIONS:
+        lattice = Binomial_Lattice_Tree_Interval(specification, option, 100, 105, RATE, up, 1/up, TENURE, NUM_PERIOD, INCOME_RATE, VOLATILITY, None, payment_values=PAYMENT_VALUES, bumped_greeks=True)
+        greeks = lattice_greeks(specification, option, 100, 105, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, payment_values=PAYMENT_VALUES, smooth=False)
+        assert lattice.price == pytest.approx(greeks["price"][0], abs=1e-12)
+        assert lattice.result.delta == pytest.approx(greeks["delta"][0], abs=1e-12)
+        assert lattice.result.vega == pytest.approx(greeks["vega"][0], abs=1e-12)
+
+
+def test_interval_bumped_greeks_refuse_foreign_up_down():
+    with pytest.raises(ValueError):
+        Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 105, RATE, 1.05, 0.96, TENURE, NUM_PERIOD, INCOME_RATE, VOLATILITY, None, bumped_greeks=True)
+
+
+def test_interval_greeks_need_two_periods():
+    lattice = Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 105, RATE, 1.1, 1/1.1, TENURE, 1, INCOME_RATE, VOLATILITY, None)
+    assert lattice.result.delta is None
+    with pytest.raises(ValueError):
+        lattice.compute_greeks()
@@ -0,0 +1,52 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.lattice_batch import price_contracts
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+RATE = 0.05
+INCOME_RATE = 0.02
+VOLATILITY = 0.3
+NUM_PERIOD = 60
+
+
+def tree_price(specification, option, spot, up, down):
+    return Binomial_Lattice_Tree(specification, option, spot, 100, RATE, up, down, datetime(2024, 1, 1), datetime(2024, 12, 31), NUM_PERIOD, INCOME_RATE, VOLATILITY).price
+
+
+@pytest.mark.parametrize("specification", list(UpDownSpecification))
+def test_batch_matches_single_contract_lattice(specification):
+    up = math.exp(VOLATILITY*math.sqrt(1/NUM_PERIOD))
+    spots = np.array([80.0, 95.0, 100.0, 120.0])
+    for option in OPTIONS:
+        expected = [tree_price(specification, option, spot, up, 1/up) for spot in spots]
+        np.testing.assert_allclose(price_contracts(specification, option, spots, 100, RATE, INCOME_RATE, VOLATILITY, 1.0, NUM_PERIOD), expected, rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize("specification", [UpDownSpecification.TRADITIONAL, UpDownSpecification.BINOMIAL_BLACK_SCHOLES])
+def test_caller_up_down_match_single_contract_lattice(specification):
+    up, down = 1.05, 0.96
+    for option in OPTIONS:
+        price = price_contracts(specification, option, 100.0, 100, RATE, INCOME_RATE, VOLATILITY, 1.0, NUM_PERIOD, up=up, down=down)[0]
+        assert price == pytest.approx(tree_price(specification, option, 100.0, up, down), abs=1e-10)
+
+
+def test_up_and_down_must_be_given_together():
+    with pytest.raises(ValueError):
+        price_contracts(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, 100, 100, RATE, INCOME_RATE, VOLATILITY, 1.0, NUM_PERIOD, up=1.05)
+
+
+def test_expiring_contracts_are_worth_intrinsic_value():
+    prices = price_contracts(UpDownSpecification.TRADITIONAL, [OptionType.AMERICAN_PUT, OptionType.EUROPEAN_CALL, OptionType.EUROPEAN_CALL], [90, 110, 110], 100, RATE, INCOME_RATE, VOLATILITY, [0.0, 0.0, 1.0], NUM_PERIOD)
+    assert prices[:2].tolist() == [10.0, 10.0]
+    assert prices[2] == pytest.approx(price_contracts(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, 110, 100, RATE, INCOME_RATE, VOLATILITY, 1.0, NUM_PERIOD)[0])
+
+
+def test_negative_tenure_is_rejected():
+    with pytest.raises(ValueError):
+        price_contracts(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, 100, 100, RATE, INCOME_RATE, VOLATILITY, -1.0, NUM_PERIOD)
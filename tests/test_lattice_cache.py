@@ -0,0 +1,54 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, Lattice_Cache, payment_present_values
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.lattice_interval import Payment, Binomial_Lattice_Tree_Interval
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+NUM_PERIOD = 100
+UP = math.exp(0.3*math.sqrt(1/NUM_PERIOD))
+
+
+def tree_price(option, strike, cache=None, spot=100):
+    return Binomial_Lattice_Tree(UpDownSpecification.TRADITIONAL, option, spot, strike, 0.05, UP, 1/UP, datetime(2024, 1, 1), datetime(2024, 12, 31), NUM_PERIOD, 0.02, 0.3, cache=cache).price
+
+
+def test_cached_prices_match_uncached_prices():
+    cache = Lattice_Cache()
+    for strike in (90, 100, 110):
+        for option in OPTIONS:
+            assert tree_price(option, strike, cache) == tree_price(option, strike)
+    # One skeleton serves every strike and option type on the same grid.
+    assert cache.stats() == {"hits": 11, "misses": 1, "evictions": 0, "entries": 1, "nodes": (NUM_PERIOD + 1)*(NUM_PERIOD + 2)//2}
+
+
+def test_cached_interval_prices_match_uncached_prices_with_payments():
+    cache = Lattice_Cache()
+    payment_values = payment_present_values([Payment(0.4, 2.0, 0.05)], 0.05, 1/NUM_PERIOD, NUM_PERIOD)
+    price = lambda option, cache: Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, option, 100, 100, 0.05, UP, 1/UP, 1.0, NUM_PERIOD, 0.02, 0.3, None, payment_values=payment_values, cache=cache).price
+    for option in OPTIONS:
+        assert price(option, cache) == price(option, None)
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_least_recently_used_skeleton_is_evicted():
+    nodes = (NUM_PERIOD + 1)*(NUM_PERIOD + 2)//2
+    cache = Lattice_Cache(max_nodes=2*nodes)
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=90)
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=100)
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=90)
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=110)
+    assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 1, "entries": 2, "nodes": 2*nodes}
+    # Spot 100 was the least recently used entry, so it is the one rebuilt.
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=90)
+    tree_price(OptionType.EUROPEAN_CALL, 100, cache, spot=100)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_lattice_larger_than_the_cache_is_not_stored():
+    cache = Lattice_Cache(max_nodes=10)
+    assert tree_price(OptionType.AMERICAN_PUT, 100, cache) == pytest.approx(tree_price(OptionType.AMERICAN_PUT, 100))
+    assert cache.stats()["entries"] == 0
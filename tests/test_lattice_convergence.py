@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.lattice_convergence import richardson_price, price_to_tolerance, DEFAULT_TOLERANCE
+from binomial_lattice.black_scholes_engine import bsm_price
+
+RATE = 0.05
+VOLATILITY = 0.25
+TENURE = 1.0
+SPECIFICATIONS = [UpDownSpecification.LEISEN_REIMER, UpDownSpecification.BINOMIAL_BLACK_SCHOLES]*2
+
+
+def test_leisen_reimer_richardson_is_closer_to_closed_form():
+    expected = bsm_price(OptionType.EUROPEAN_CALL, 100, 105, RATE, 0.02, 0.3, TENURE)[0]
+    plain = price_contracts(UpDownSpecification.LEISEN_REIMER, OptionType.EUROPEAN_CALL, 100, 105, RATE, 0.02, 0.3, TENURE, 51)[0]
+    extrapolated = richardson_price(UpDownSpecification.LEISEN_REIMER, OptionType.EUROPEAN_CALL, 100, 105, RATE, 0.02, 0.3, TENURE, 51)[0]
+    assert abs(extrapolated - expected) < abs(plain - expected)
+    assert abs(extrapolated - expected) < 1e-5
+
+
+def test_european_prices_to_tolerance_match_closed_form():
+    options = [OptionType.EUROPEAN_PUT, OptionType.EUROPEAN_PUT, OptionType.EUROPEAN_CALL, OptionType.EUROPEAN_CALL]
+    prices, _, converged = price_to_tolerance(SPECIFICATIONS, options, [110, 110, 95, 95], 105, RATE, 0.02, VOLATILITY, TENURE)
+    assert converged.all()
+    np.testing.assert_allclose(prices, bsm_price(options, [110, 110, 95, 95], 105, RATE, 0.02, VOLATILITY, TENURE), atol=DEFAULT_TOLERANCE)
+
+
+def test_american_prices_to_tolerance_match_fine_lattice():
+    options = [OptionType.AMERICAN_PUT, OptionType.AMERICAN_PUT, OptionType.AMERICAN_CALL, OptionType.AMERICAN_CALL]
+    contract = (SPECIFICATIONS, options, [110, 110, 95, 95], 105, RATE, [0.02, 0.02, 0.06, 0.06], VOLATILITY, TENURE)
+    reference = price_contracts(*contract, 10001)
+    prices, periods, converged = price_to_tolerance(*contract)
+    # The Leisen-Reimer put is the case whose 1/N^2 extrapolation stopped at N=51, 7.8e-4 off.
+    assert converged[0] and periods[0] > 51
+    assert np.all(np.abs(prices - reference)[converged] <= DEFAULT_TOLERANCE)
+
+
+def test_oscillating_specifications_are_rejected():
+    with pytest.raises(ValueError):
+        price_to_tolerance(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, 100, 105, RATE, 0.02, VOLATILITY, TENURE)
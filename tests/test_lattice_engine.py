@@ -0,0 +1,41 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, Lattice_Backend
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.lattice_interval import Payment, Discrete_Payment_Node, Binomial_Lattice_Tree_Interval
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+RATE = 0.05
+INCOME_RATE = 0.02
+VOLATILITY = 0.3
+TENURE = 1.0
+PAYMENTS = [Payment(0.25, 1.5, RATE), Payment(0.6, 2.0, RATE), Payment(0.9, 1.0, RATE)]
+
+
+@pytest.mark.parametrize("option", OPTIONS)
+@pytest.mark.parametrize("specification", [UpDownSpecification.TRADITIONAL, UpDownSpecification.ALTERNATIVE])
+def test_tree_and_recombining_backends_agree(specification, option):
+    num_period = 8
+    up = math.exp(VOLATILITY*math.sqrt(TENURE/num_period))
+    lattices = [Binomial_Lattice_Tree(specification, option, 100, 95, RATE, up, 1/up, datetime(2024, 1, 1), datetime(2024, 12, 31), num_period, INCOME_RATE, VOLATILITY, backend=backend) for backend in (Lattice_Backend.TREE, Lattice_Backend.RECOMBINING)]
+    assert lattices[0].price == pytest.approx(lattices[1].price, abs=1e-13)
+
+
+@pytest.mark.parametrize("option", OPTIONS)
+def test_tree_and_recombining_backends_agree_with_payments(option):
+    num_period = 8
+    up = math.exp(VOLATILITY*math.sqrt(TENURE/num_period))
+    prices = []
+    for backend in (Lattice_Backend.TREE, Lattice_Backend.RECOMBINING):
+        payment_node = Discrete_Payment_Node(0, TENURE/num_period, num_period, RATE, PAYMENTS)
+        prices.append(Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, option, 100, 95, RATE, up, 1/up, TENURE, num_period, INCOME_RATE, VOLATILITY, payment_node, backend=backend).price)
+    assert prices[0] == pytest.approx(prices[1], abs=1e-13)
+
+
+def test_recombining_lattice_runs_far_beyond_the_tree_limit():
+    up = math.exp(VOLATILITY*math.sqrt(TENURE/2000))
+    lattice = Binomial_Lattice_Tree(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 95, RATE, up, 1/up, datetime(2024, 1, 1), datetime(2024, 12, 31), 2000, INCOME_RATE, VOLATILITY)
+    assert 0 < lattice.price < 95
@@ -0,0 +1,60 @@
+import io
+import math
+
+import pandas as pd
+import pytest
+
+import binomial_lattice.lattice_interval as lattice_interval
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, Lattice_Backend, Lattice_Result
+from binomial_lattice.lattice_interval import Binomial_Lattice_Tree_Interval
+
+NUM_PERIOD = 4
+COLUMNS = ["identifier", "value", "spot_value", "parent", "level", "upChild", "downChild"]
+
+
+def price(backend, node_export=None):
+    up = math.exp(0.3*math.sqrt(1/NUM_PERIOD))
+    return Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 100, 0.05, up, 1/up, 1.0, NUM_PERIOD, 0.02, 0.3, None, backend=backend, node_export=node_export)
+
+
+def exported(backend):
+    stream = io.StringIO()
+    price(backend, stream)
+    stream.seek(0)
+    return pd.read_csv(stream, index_col=0)
+
+
+@pytest.mark.parametrize("backend", list(Lattice_Backend))
+def test_export_writes_once_to_a_stream(backend, monkeypatch):
+    calls = []
+    monkeypatch.setattr(lattice_interval, "write_nodes", lambda node_list, destination, file_format="csv": calls.append((len(node_list), destination, file_format)))
+    stream = io.StringIO()
+    price(backend, stream)
+    rows = NUM_PERIOD*(NUM_PERIOD + 1)//2 if backend == Lattice_Backend.RECOMBINING else 2**NUM_PERIOD - 1
+    assert calls == [(rows, stream, "csv")]
+
+
+@pytest.mark.parametrize("backend", list(Lattice_Backend))
+def test_no_export_by_default(backend, monkeypatch):
+    calls = []
+    monkeypatch.setattr(lattice_interval, "write_nodes", lambda *args, **kwargs: calls.append(args))
+    result = price(backend).result
+    assert calls == []
+    assert isinstance(result, Lattice_Result) and result.price > 0 and result.delta < 0
+
+
+def test_backends_export_the_same_columns_and_nodes():
+    tree = exported(Lattice_Backend.TREE)
+    recombining = exported(Lattice_Backend.RECOMBINING)
+    assert list(tree.columns) == COLUMNS
+    assert list(recombining.columns) == COLUMNS
+    # Every recombined node appears in the tree under the same name, with the same values and parent.
+    merged = recombining.merge(tree, on="identifier", suffixes=("", "_tree"))
+    assert len(merged) == len(recombining)
+    for column in ("value", "spot_value"):
+        assert merged[column].to_numpy() == pytest.approx(merged[column + "_tree"].to_numpy(), abs=1e-12)
+    assert merged["parent"].fillna("").tolist() == merged["parent_tree"].fillna("").tolist()
+    assert merged["level"].tolist() == merged["level_tree"].tolist()
+    # Each parent's child columns name the node that lists it as parent.
+    children = set(recombining["upChild"]) | set(recombining["downChild"])
+    assert set(recombining["identifier"][recombining["level"] > 0]) <= children
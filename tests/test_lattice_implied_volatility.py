@@ -0,0 +1,36 @@
+import numpy as np
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.lattice_implied_volatility import implied_volatility, Implied_Volatility_Status
+
+RATE = 0.05
+INCOME_RATE = 0.02
+TENURE = 1.0
+NUM_PERIOD = 101
+
+
+def test_implied_volatility_round_trip():
+    volatility = np.array([0.15, 0.3, 0.6])
+    prices = price_contracts(UpDownSpecification.LEISEN_REIMER, OptionType.AMERICAN_PUT, 100, [90, 100, 110], RATE, INCOME_RATE, volatility, TENURE, NUM_PERIOD)
+    result = implied_volatility(UpDownSpecification.LEISEN_REIMER, OptionType.AMERICAN_PUT, prices, 100, [90, 100, 110], RATE, INCOME_RATE, TENURE, NUM_PERIOD)
+    assert result["converged"].all()
+    np.testing.assert_allclose(result["volatility"], volatility, atol=1e-5)
+
+
+def test_mixed_contracts_round_trip():
+    specifications = [UpDownSpecification.TRADITIONAL, UpDownSpecification.BINOMIAL_BLACK_SCHOLES, UpDownSpecification.ALTERNATIVE, UpDownSpecification.LEISEN_REIMER]
+    options = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+    volatility = np.array([0.2, 0.35, 0.5, 0.25])
+    prices = price_contracts(specifications, options, [95, 100, 105, 120], 100, RATE, INCOME_RATE, volatility, TENURE, NUM_PERIOD)
+    result = implied_volatility(specifications, options, prices, [95, 100, 105, 120], 100, RATE, INCOME_RATE, TENURE, NUM_PERIOD)
+    assert result["converged"].all()
+    np.testing.assert_allclose(result["volatility"], volatility, atol=1e-5)
+
+
+def test_prices_outside_the_volatility_range_are_reported():
+    # Below the intrinsic value and above the spot no volatility reproduces the price.
+    result = implied_volatility(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, [5.0, 150.0], [90, 100], 100, RATE, INCOME_RATE, TENURE, NUM_PERIOD)
+    assert not result["converged"].any()
+    assert np.isnan(result["volatility"]).all()
+    assert result["status"].tolist() == [Implied_Volatility_Status.PRICE_BELOW_RANGE, Implied_Volatility_Status.PRICE_ABOVE_RANGE]
@@ -0,0 +1,78 @@
+import io
+import logging
+import math
+from datetime import datetime
+
+import numpy as np
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, Lattice_Cache
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.lattice_interval import Payment, Discrete_Payment_Node, Binomial_Lattice_Tree_Interval
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.lattice_instrumentation import Pricing_Instrumentation, Prometheus_Sink, logging_sink, lattice_node_count
+
+NUM_PERIOD = 20
+UP = math.exp(0.3*math.sqrt(1/NUM_PERIOD))
+
+
+def recorded():
+    events = []
+    return events, Pricing_Instrumentation(events.append)
+
+
+def tree(instrumentation, **kwargs):
+    return Binomial_Lattice_Tree(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 100, 0.05, UP, 1/UP, datetime(2024, 1, 1), datetime(2024, 12, 31), NUM_PERIOD, kwargs.pop("income_rate", 0.02), 0.3, instrumentation=instrumentation, **kwargs)
+
+
+def test_tree_emits_construction_and_induction():
+    events, instrumentation = recorded()
+    cache = Lattice_Cache()
+    tree(instrumentation, cache=cache)
+    tree(instrumentation, cache=cache)
+    assert [event["phase"] for event in events] == ["lattice_construction", "backward_induction"]*2
+    assert all(event["seconds"] >= 0 and event["nodes"] == lattice_node_count(NUM_PERIOD) for event in events)
+    assert (events[0]["cache_misses"], events[2]["cache_hits"]) == (1, 1)
+    assert events[1]["bytes"] > 0
+
+
+def test_term_structure_and_spot_shift_paths_emit_events():
+    events, instrumentation = recorded()
+    tree(instrumentation, income_rate=np.full(NUM_PERIOD, 0.02))
+    tree(instrumentation, spot_shifts=5)
+    assert [event["phase"] for event in events] == ["lattice_construction", "backward_induction", "backward_induction"]
+    assert events[0]["term_structure"] == 1 and events[1]["term_structure"] == 1
+    assert events[2]["spot_shifts"] == 5 and events[2]["nodes"] == (NUM_PERIOD + 1)*(NUM_PERIOD + 11)
+
+
+def test_interval_emits_every_phase_in_pipeline_order():
+    events, instrumentation = recorded()
+    payment_node = Discrete_Payment_Node(0, 1/NUM_PERIOD, NUM_PERIOD, 0.05, [Payment(0.5, 2.0, 0.05)], instrumentation=instrumentation)
+    Binomial_Lattice_Tree_Interval(UpDownSpecification.TRADITIONAL, OptionType.AMERICAN_PUT, 100, 100, 0.05, UP, 1/UP, 1.0, NUM_PERIOD, 0.02, 0.3, payment_node, node_export=io.StringIO(), instrumentation=instrumentation, bumped_greeks=True)
+    assert [event["phase"] for event in events] == ["payment_discounting", "payment_lookup", "lattice_construction", "backward_induction", "export", "greeks"]
+    assert events[0]["payments"] == 1 and events[0]["levels"] == NUM_PERIOD + 1
+    assert events[4]["rows"] == NUM_PERIOD*(NUM_PERIOD + 1)//2 and events[4]["format"] == "csv"
+    assert events[5]["scenarios"] == 5
+
+
+def test_batch_emits_one_induction_event_per_chunk():
+    events, instrumentation = recorded()
+    price_contracts(UpDownSpecification.TRADITIONAL, OptionType.EUROPEAN_CALL, np.linspace(90, 110, 10), 100, 0.05, 0.02, 0.3, 1.0, NUM_PERIOD, chunk_size=4, instrumentation=instrumentation)
+    assert [event["phase"] for event in events] == ["batch_parameters"] + ["batch_backward_induction"]*3
+    assert [event["contracts"] for event in events] == [10, 4, 4, 2]
+
+
+def test_sinks_render_events():
+    sink = Prometheus_Sink()
+    sink({"phase": "export", "seconds": 0.5, "rows": 3, "format": "csv"})
+    sink({"phase": "export", "seconds": 0.25, "rows": 2, "format": "csv"})
+    rendered = sink.render()
+    assert 'lattice_phase_calls_total{phase="export"} 2' in rendered
+    assert 'lattice_rows_total{phase="export"} 5' in rendered
+    assert 'lattice_phase_seconds_total{phase="export"} 0.75' in rendered
+
+    stream = io.StringIO()
+    logger = logging.getLogger("lattice.test")
+    logger.addHandler(logging.StreamHandler(stream))
+    logger.setLevel(logging.INFO)
+    logging_sink(logger)({"phase": "greeks", "seconds": 0.1, "scenarios": 5})
+    assert stream.getvalue().strip() == "phase=greeks seconds=0.1 scenarios=5"
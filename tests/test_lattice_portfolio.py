@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType, payment_present_values
+from binomial_lattice.lattice_interval import Payment, Binomial_Lattice_Tree_Interval
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.lattice_portfolio import value_portfolio
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+RATE = 0.05
+INCOME_RATE = 0.02
+VOLATILITY = 0.3
+TENURE = 1.0
+NUM_PERIOD = 50
+PAYMENTS = [Payment(0.25, 1.5, RATE), Payment(0.6, 2.0, RATE), Payment(0.9, 1.0, RATE)]
+
+
+def portfolio(size):
+    specifications = [UpDownSpecification.TRADITIONAL, UpDownSpecification.LEISEN_REIMER, UpDownSpecification.BINOMIAL_BLACK_SCHOLES]*size
+    options = OPTIONS*size
+    count = 3*size
+    return specifications[:count], options[:count], np.linspace(80, 120, count)
+
+
+def test_process_pool_matches_in_process():
+    specifications, options, spots = portfolio(10)
+    in_process = value_portfolio(specifications, options, spots, 100, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, use_processes=False)
+    pooled = value_portfolio(specifications, options, spots, 100, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, chunk_size=7, max_workers=2)
+    np.testing.assert_array_equal(pooled, in_process)
+    np.testing.assert_array_equal(in_process, price_contracts(specifications, options, spots, 100, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD))
+
+
+def test_process_pool_matches_in_process_with_payments():
+    specifications, options, spots = portfolio(10)
+    payment_values = payment_present_values(PAYMENTS, RATE, TENURE/NUM_PERIOD, NUM_PERIOD)
+    payment_values = np.outer(np.linspace(0, 2, spots.shape[0]), payment_values)
+    in_process = value_portfolio(specifications, options, spots, 100, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, use_processes=False, payment_values=payment_values)
+    pooled = value_portfolio(specifications, options, spots, 100, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, chunk_size=7, max_workers=2, payment_values=payment_values)
+    np.testing.assert_array_equal(pooled, in_process)
+
+
+def test_batch_matches_interval_with_payments():
+    up = math.exp(VOLATILITY*math.sqrt(TENURE/NUM_PERIOD))
+    payment_values = payment_present_values(PAYMENTS, RATE, TENURE/NUM_PERIOD, NUM_PERIOD)
+    for specification in (UpDownSpecification.TRADITIONAL, UpDownSpecification.LEISEN_REIMER, UpDownSpecification.BINOMIAL_BLACK_SCHOLES):
+        expected = [Binomial_Lattice_Tree_Interval(specification, option, 100, 95, RATE, up, 1/up, TENURE, NUM_PERIOD, INCOME_RATE, VOLATILITY, None, payment_values=payment_values).price for option in OPTIONS]
+        prices = price_contracts(specification, OPTIONS, np.full(len(OPTIONS), 100.0), 95, RATE, INCOME_RATE, VOLATILITY, TENURE, NUM_PERIOD, payment_values=payment_values)
+        np.testing.assert_allclose(prices, expected, rtol=0, atol=1e-12)
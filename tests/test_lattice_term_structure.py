@@ -0,0 +1,46 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from binomial_lattice.lattice_engine import UpDownSpecification, OptionType
+from binomial_lattice.lattice_tree import Binomial_Lattice_Tree
+from binomial_lattice.lattice_term_structure import Term_Structure_Curve, Term_Structure_Lattice
+from binomial_lattice.black_scholes_engine import bsm_price
+
+OPTIONS = [OptionType.EUROPEAN_CALL, OptionType.AMERICAN_CALL, OptionType.EUROPEAN_PUT, OptionType.AMERICAN_PUT]
+NUM_PERIOD = 200
+
+
+def tree_price(specification, option, risk_free_rate, continuous_income_rate, volatility):
+    up = math.exp(0.3*math.sqrt(1/NUM_PERIOD))
+    return Binomial_Lattice_Tree(specification, option, 100, 105, risk_free_rate, up, 1/up, datetime(2024, 1, 1), datetime(2024, 12, 31), NUM_PERIOD, continuous_income_rate, volatility).price
+
+
+@pytest.mark.parametrize("option", OPTIONS)
+@pytest.mark.parametrize("specification", [UpDownSpecification.TRADITIONAL, UpDownSpecification.ALTERNATIVE])
+def test_flat_term_structures_reproduce_the_flat_price(specification, option):
+    expected = tree_price(specification, option, 0.05, 0.02, 0.3)
+    flat_arrays = tree_price(specification, option, np.full(NUM_PERIOD, 0.05), np.full(NUM_PERIOD, 0.02), np.full(NUM_PERIOD, 0.3))
+    flat_curves = tree_price(specification, option, Term_Structure_Curve([0.0, 0.5], [0.05, 0.05]), 0.02, Term_Structure_Curve([0.0], [0.3]))
+    assert flat_arrays == pytest.approx(expected, abs=1e-10)
+    assert flat_curves == pytest.approx(expected, abs=1e-10)
+
+
+def test_european_price_uses_average_rate_and_variance():
+    rate = Term_Structure_Curve([0.0, 0.25, 0.5], [0.02, 0.04, 0.07])
+    income_rate = Term_Structure_Curve([0.0, 0.6], [0.01, 0.03])
+    volatility = Term_Structure_Curve([0.0, 0.4], [0.2, 0.35])
+    lattice = Term_Structure_Lattice(UpDownSpecification.TRADITIONAL, 100, rate, income_rate, volatility, 1.0, 2000)
+    average_volatility = math.sqrt(0.4*0.2**2 + 0.6*0.35**2)
+    expected = bsm_price(OptionType.EUROPEAN_CALL, 100, 105, float(rate.average(0, 1.0)), float(income_rate.average(0, 1.0)), average_volatility, 1.0)[0]
+    assert lattice.price(OptionType.EUROPEAN_CALL, 105) == pytest.approx(expected, abs=5e-3)
+
+
+def test_curve_integrals_are_exact():
+    curve = Term_Structure_Curve([0.0, 1.0, 2.0], [0.01, 0.03, 0.05])
+    assert curve.integral(2.5) == pytest.approx(0.01 + 0.03 + 0.025)
+    assert curve.value(1.0) == 0.03
+    with pytest.raises(ValueError):
+        Term_Structure_Curve([0.5, 1.0], [0.01, 0.02])
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+import binomial_lattice
+from binomial_lattice.lattice_batch import price_contracts
+from binomial_lattice.lattice_cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_import_loads_no_numerical_dependencies():
+    assert run_python("import sys, binomial_lattice; print(sorted(name for name in ('numpy', 'pandas', 'pyarrow') if name in sys.modules))") == "[]"
+
+
+def test_lattice_greeks_export_is_the_function():
+    # Importing the engine that defines it must not replace the export with a module.
+    import binomial_lattice.lattice_interval
+    assert callable(binomial_lattice.lattice_greeks) and binomial_lattice.lattice_greeks.__name__ == "lattice_greeks"
+    assert run_python("import binomial_lattice.lattice_interval; from binomial_lattice import lattice_greeks; print(lattice_greeks.__module__)") == "binomial_lattice.greeks_engine"
+
+
+def test_every_export_resolves():
+    for name in binomial_lattice.__all__:
+        assert getattr(binomial_lattice, name) is not None
+
+
+def test_cli_csv_round_trip(tmp_path):
+    contracts = pd.DataFrame({
+        "specification": ["TRADITIONAL", "LEISEN_REIMER", "BINOMIAL_BLACK_SCHOLES", "ALTERNATIVE", "TRADITIONAL"],
+        "option": ["AMERICAN_PUT", "EUROPEAN_CALL", "AMERICAN_CALL", "EUROPEAN_PUT", "EUROPEAN_CALL"],
+        "present_spot": [90.0, 100.0, 110.0, 95.0, 120.0],
+        "strike_price": [100.0, 100.0, 105.0, 100.0, 100.0],
+        "risk_free_rate": 0.05,
+        "continuous_income_rate": 0.02,
+        "volatility": [0.2, 0.3, 0.25, 0.4, 0.3],
+        "tenure": [1.0, 0.5, 2.0, 1.0, 0.0],
+    })
+    input_path = tmp_path / "contracts.csv"
+    output_path = tmp_path / "prices.csv"
+    metrics_path = tmp_path / "metrics.prom"
+    contracts.to_csv(input_path, index=False)
+    main([str(input_path), str(output_path), "--num-period", "51", "--read-rows", "2", "--metrics", str(metrics_path)])
+
+    priced = pd.read_csv(output_path)
+    assert list(priced.columns) == list(contracts.columns) + ["price"]
+    pd.testing.assert_frame_equal(priced[list(contracts.columns)], contracts)
+    expected = price_contracts(*[contracts[column].to_numpy() for column in contracts.columns], 51)
+    np.testing.assert_allclose(priced["price"].to_numpy(), expected, rtol=1e-14)
+    # The expired contract is priced at intrinsic value without a lattice.
+    assert 'lattice_contracts_total{phase="batch_backward_induction"} 4' in metrics_path.read_text()